@@ -9,6 +9,7 @@ METADATA_FILE = "metadata.json"
 STATUS_PICKLE_FILE = "status.pickle"
 FULL_DF_FILE = "all_data.csv"
 REDUCED_DF_FILE = "reduced_data.csv"
+#: Name of the file containing the data needed for offline report generation.
 REPORT_DATA_FILE = "report_data.pickle"
 STD_ENDING = "__std"
 RESTART_PARAM_NAME = "job_restarts"
@@ -26,5 +27,9 @@ RESERVED_PARAMS = (ID, ITERATION, RESTART_PARAM_NAME)
 
 CONCLUDED_WITHOUT_RESULTS_GRACE_TIME_IN_SECS = 5.0
 JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS = 0.2
+#: Maximum time the job manager loop waits for messages from jobs when there is nothing
+#: to submit.  Still needed for things that are not signalled by messages (e.g. failed
+#: jobs detected by the cluster system or keyboard input).
+JOB_MANAGER_MAX_IDLE_WAIT_TIME_IN_SECS = 1.0
 
 RETURN_CODE_FOR_RESUME = 3
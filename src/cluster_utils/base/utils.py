@@ -63,9 +63,8 @@ def flatten_nested_string_dict(nested_dict, prepend=""):
         if not isinstance(key, str):
             raise TypeError("Only strings as keys expected")
         if isinstance(value, dict):
-            for sub in flatten_nested_string_dict(
-                value, prepend=prepend + str(key) + constants.OBJECT_SEPARATOR
-            ):
-                yield sub
+            yield from flatten_nested_string_dict(
+                value, prepend=prepend + key + constants.OBJECT_SEPARATOR
+            )
         else:
-            yield prepend + str(key), value
+            yield prepend + key, value
@@ -247,7 +247,7 @@ def initialize_job(
         atexit.register(comm.report_exit_at_server)
         comm.submission_state.connection_active = True
 
-    submission_state.start_time = time.time()
+    submission_state.start_time = time.monotonic()
 
     # TODO should probably rather be an assert, there should always be a working dir
     if "working_dir" in final_params:
@@ -294,7 +294,7 @@ def finalize_job(metrics: MutableMapping[str, float], params) -> None:
     flattened_params = dict(flatten_nested_string_dict(params))
     _save_dict_as_one_line_csv(flattened_params, param_file)
 
-    time_elapsed = time.time() - submission_state.start_time
+    time_elapsed = time.monotonic() - submission_state.start_time
     if "time_elapsed" not in metrics:
         metrics["time_elapsed"] = time_elapsed
     else:
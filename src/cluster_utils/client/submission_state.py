@@ -5,4 +5,5 @@ communication_server_port = None
 job_id = None
 connection_details_available = False
 connection_active = False
+#: Time stamp (of the monotonic clock) when the job was initialized
 start_time: float
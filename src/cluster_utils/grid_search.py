@@ -10,7 +10,6 @@ from cluster_utils.base.utils import OptionalDependencyImport
 
 with OptionalDependencyImport("runner"):
     from cluster_utils.base.constants import FULL_DF_FILE
-    from cluster_utils.server.git_utils import make_git_params
     from cluster_utils.server.job_manager import grid_search
     from cluster_utils.server.latex_utils import (
         SectionFromJsonHook,
@@ -21,12 +20,9 @@ with OptionalDependencyImport("runner"):
         SingularitySettings,
         init_main_script_argument_parser,
         read_main_script_params_from_args,
+        setup_run_paths,
     )
-    from cluster_utils.server.utils import (
-        get_time_string,
-        make_temporary_dir,
-        save_report_data,
-    )
+    from cluster_utils.server.utils import save_report_data
 
 
 def main() -> int:
@@ -55,28 +51,7 @@ def main() -> int:
     json_full_name = os.path.abspath(sys.argv[1])
 
     opt_procedure_name = params.optimization_procedure_name
-
-    home = str(Path.home())
-    results_path = os.path.join(home, params.results_dir, opt_procedure_name)
-
-    time = get_time_string()
-    jobs_path = make_temporary_dir(f"{opt_procedure_name}-{time}-jobs")
-
-    run_in_working_dir = params.get("run_in_working_dir", False)
-    if not run_in_working_dir:
-        main_path = make_temporary_dir(f"{opt_procedure_name}-{time}-project")
-        git_params = make_git_params(params.get("git_params"), main_path)
-    else:
-        main_path = os.getcwd()
-        git_params = None
-
-    base_paths_and_files = dict(
-        main_path=main_path,
-        script_to_run=params.script_relative_path,
-        result_dir=results_path,
-        jobs_dir=jobs_path,
-        **params.environment_setup,
-    )
+    base_paths_and_files, git_params = setup_run_paths(params)
 
     class DummyDistribution:
         def __init__(self, param, values):
@@ -89,11 +64,12 @@ def main() -> int:
     ]
     hyperparam_names = [dummy_dist.param_name for dummy_dist in hyperparam_dict]
 
-    num_duplicates = Counter(hyperparam_names)
-    if num_duplicates and max(num_duplicates.values()) > 1:
+    duplicates = [
+        name for name, count in Counter(hyperparam_names).items() if count > 1
+    ]
+    if duplicates:
         raise ValueError(
-            "There we duplicate entries in the list of hyperparameters e.g."
-            f" {num_duplicates.most_common}"
+            f"There are duplicate entries in the list of hyperparameters: {duplicates}"
         )
 
     singularity_settings = (
@@ -127,22 +103,22 @@ def main() -> int:
         )
         return 1
 
-    df.to_csv(os.path.join(base_paths_and_files["result_dir"], FULL_DF_FILE))
+    result_dir = Path(base_paths_and_files["result_dir"])
+    df.to_csv(result_dir / FULL_DF_FILE)
 
     relevant_params = [param.param_name for param in hyperparam_dict]
-    output_pdf = os.path.join(
-        base_paths_and_files["result_dir"],
-        f"{params.optimization_procedure_name}_report.pdf",
-    )
+    output_pdf = result_dir / f"{params.optimization_procedure_name}_report.pdf"
 
     json_hook = SectionFromJsonHook(
         section_title="Optimization setting script",
         section_generator=StaticSectionGenerator(json_full_name),
     )
 
-    # save further data that is needed for offline report generation
+    # save further data that is needed for offline report generation (this is done
+    # independently of the generate_report setting, so that the report can always be
+    # generated manually later)
     save_report_data(
-        base_paths_and_files["result_dir"],
+        result_dir,
         params=relevant_params,
         metrics=metrics,
         submission_hook_stats=submission_hook_stats,
@@ -6,54 +6,55 @@ sample the values of the hyperparameters.
 
 from __future__ import annotations
 
+import logging
 import os
 import sys
-from pathlib import Path
 
 from cluster_utils.base.utils import OptionalDependencyImport
 
 with OptionalDependencyImport("runner"):
     from cluster_utils.server import distributions, latex_utils
-    from cluster_utils.server.git_utils import make_git_params
     from cluster_utils.server.job_manager import hp_optimization
     from cluster_utils.server.settings import (
         GenerateReportSetting,
         SingularitySettings,
         init_main_script_argument_parser,
         read_main_script_params_from_args,
+        setup_run_paths,
     )
-    from cluster_utils.server.utils import (
-        get_time_string,
-        make_temporary_dir,
-    )
+
+
+_DISTRIBUTIONS = {
+    "TruncatedNormal": distributions.TruncatedNormal,
+    "TruncatedLogNormal": distributions.TruncatedLogNormal,
+    "IntNormal": distributions.IntNormal,
+    "IntLogNormal": distributions.IntLogNormal,
+    "Discrete": distributions.Discrete,
+}
 
 
 def get_distribution(distribution, **kwargs):
-    distr_dict = {
-        "TruncatedNormal": distributions.TruncatedNormal,
-        "TruncatedLogNormal": distributions.TruncatedLogNormal,
-        "IntNormal": distributions.IntNormal,
-        "IntLogNormal": distributions.IntLogNormal,
-        "Discrete": distributions.Discrete,
-    }
-
-    if distribution not in distr_dict:
+    logger = logging.getLogger("cluster_utils")
+
+    distribution_class = _DISTRIBUTIONS.get(distribution)
+    if distribution_class is None:
         raise NotImplementedError(f"Distribution {distribution} does not exist")
 
     if distribution == "Discrete" and "bounds" in kwargs:
-        print(
+        logger.warning(
             "Change 'bounds' to 'options' for a Discrete distribution!! Trying to"
             " continue..."
         )
         kwargs["options"] = kwargs.pop("bounds")
 
     if distribution != "Discrete" and "options" in kwargs:
-        print(
-            "Change 'options' to 'bounds' to options for a"
-            f" {distribution} distribution!! Trying to continue..."
+        logger.warning(
+            "Change 'options' to 'bounds' for a %s distribution!! Trying to"
+            " continue...",
+            distribution,
         )
         kwargs["bounds"] = kwargs.pop("options")
-    return distr_dict[distribution](**kwargs)
+    return distribution_class(**kwargs)
 
 
 def main() -> int:
@@ -73,28 +74,7 @@ def main() -> int:
     json_full_name = os.path.abspath(sys.argv[1])
 
     opt_procedure_name = params.optimization_procedure_name
-
-    home = str(Path.home())
-    results_path = os.path.join(home, params.results_dir, opt_procedure_name)
-
-    time = get_time_string()
-    jobs_path = make_temporary_dir(f"{opt_procedure_name}-{time}-jobs")
-
-    run_in_working_dir = params.get("run_in_working_dir", False)
-    if not run_in_working_dir:
-        main_path = make_temporary_dir(f"{opt_procedure_name}-{time}-project")
-        git_params = make_git_params(params.get("git_params"), main_path)
-    else:
-        main_path = os.getcwd()
-        git_params = None
-
-    base_paths_and_files: dict[str, str] = dict(
-        main_path=main_path,
-        script_to_run=params.script_relative_path,
-        result_dir=results_path,
-        jobs_dir=jobs_path,
-        **params.environment_setup,
-    )
+    base_paths_and_files, git_params = setup_run_paths(params)
 
     distribution_list = [get_distribution(**item) for item in params.optimized_params]
 
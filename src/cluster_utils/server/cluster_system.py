@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import logging
 import shutil
+import threading
 from abc import ABC, abstractmethod
-from collections import deque
+from collections import defaultdict, deque
 from typing import TYPE_CHECKING, NewType, Optional, Sequence
 
 import colorama
@@ -39,11 +40,23 @@ class ClusterSubmission(ABC):
 
     By calling :meth:`submit_next` you can then submit jobs from the queue one by one in
     FIFO order.
+
+    Job statuses are tracked via :attr:`Job.status_listener`, so counting the jobs with
+    a certain status does not need to iterate over all jobs.  This relies on a job only
+    being set to ``CONCLUDED`` after its results have been set.
     """
 
     def __init__(self, paths: dict[str, str], remove_jobs_dir: bool = True) -> None:
         #: List of all jobs that have been registered via :meth:`add_jobs`.
         self.jobs: list[Job] = []
+        self._jobs_by_id: dict[int, Job] = {}
+        # Jobs per status (dicts are used as insertion-ordered sets).  Statuses are
+        # changed by both the main thread and the communication server thread.
+        self._jobs_by_status: defaultdict[int, dict[Job, None]] = defaultdict(dict)
+        self._jobs_by_status_lock = threading.Lock()
+        self._n_submitted_jobs = 0
+        # successful jobs that have not been returned by pop_new_successful_jobs yet
+        self._new_successful_jobs: list[Job] = []
         #: Queue of jobs that are waiting to be submitted.
         self.submission_queue: deque[Job] = deque()
         self.remove_jobs_dir = remove_jobs_dir
@@ -102,10 +115,7 @@ class ClusterSubmission(ABC):
         return False
 
     def get_job(self, job_id):
-        for job in self.jobs:
-            if job.id == job_id:
-                return job
-        return None
+        return self._jobs_by_id.get(job_id)
 
     def add_jobs(self, jobs: Job | list[Job], enqueue: bool = True) -> None:
         """Register a new job.
@@ -117,11 +127,34 @@ class ClusterSubmission(ABC):
         """
         if not isinstance(jobs, list):
             jobs = [jobs]
-        self.jobs = self.jobs + jobs
+        self.jobs.extend(jobs)
+
+        with self._jobs_by_status_lock:
+            for job in jobs:
+                self._jobs_by_id[job.id] = job
+                self._jobs_by_status[job.status][job] = None
+                if job.status == JobStatus.CONCLUDED:
+                    self._new_successful_jobs.append(job)
+                job.status_listener = self._on_job_status_change
 
         if enqueue:
             self.submission_queue.extend(jobs)
 
+    def _on_job_status_change(self, job: Job, old_status: int, new_status: int) -> None:
+        with self._jobs_by_status_lock:
+            self._jobs_by_status[old_status].pop(job, None)
+            self._jobs_by_status[new_status][job] = None
+            if new_status == JobStatus.CONCLUDED:
+                self._new_successful_jobs.append(job)
+
+    def _jobs_with_status(self, *statuses: int) -> list[Job]:
+        with self._jobs_by_status_lock:
+            return [job for status in statuses for job in self._jobs_by_status[status]]
+
+    def _n_jobs_with_status(self, *statuses: int) -> int:
+        with self._jobs_by_status_lock:
+            return sum(len(self._jobs_by_status[status]) for status in statuses)
+
     def enqueue_job_for_submission(self, job: Job) -> None:
         """Add job to the submission queue."""
         self.submission_queue.append(job)
@@ -147,78 +180,80 @@ class ClusterSubmission(ABC):
 
         self._submit(job)
 
+    def submit_next_batch(self, max_jobs: Optional[int] = None) -> None:
+        """Submit up to ``max_jobs`` jobs from the submission queue at once.
+
+        Depending on the cluster system, this is much faster than submitting the jobs
+        one by one with :meth:`submit_next` (see :meth:`submit_batch_fn`).
+
+        Args:
+            max_jobs: Maximum number of jobs to submit.  If None, all jobs in the queue
+                are submitted.
+        """
+        logger = logging.getLogger("cluster_utils")
+        n_jobs = len(self.submission_queue)
+        if max_jobs is not None:
+            n_jobs = min(max_jobs, n_jobs)
+        if n_jobs <= 0:
+            return
+        logger.debug("Submit next %d jobs from queue.", n_jobs)
+        jobs = [self.submission_queue.popleft() for _ in range(n_jobs)]
+        self._submit_batch(jobs)
+
     @property
     def submitted_jobs(self) -> list[Job]:
         return [job for job in self.current_jobs if job.cluster_id is not None]
 
     @property
     def n_submitted_jobs(self) -> int:
-        return len(self.submitted_jobs)
+        return self._n_submitted_jobs
 
     @property
     def running_jobs(self) -> list[Job]:
-        running_jobs = [
-            job for job in self.current_jobs if job.status == JobStatus.RUNNING
-        ]
-        return running_jobs
+        return self._jobs_with_status(JobStatus.RUNNING)
 
     @property
     def n_running_jobs(self) -> int:
-        return len(self.running_jobs)
+        return self._n_jobs_with_status(JobStatus.RUNNING)
 
     @property
     def completed_jobs(self) -> list[Job]:
-        completed_jobs = [
-            job
-            for job in self.current_jobs
-            if job.status == JobStatus.CONCLUDED or job.status == JobStatus.FAILED
-        ]
-        return completed_jobs
+        return self._jobs_with_status(JobStatus.CONCLUDED, JobStatus.FAILED)
 
     @property
     def n_completed_jobs(self) -> int:
-        return len(self.completed_jobs)
+        return self._n_jobs_with_status(JobStatus.CONCLUDED, JobStatus.FAILED)
 
     @property
     def idle_jobs(self) -> list[Job]:
-        idle_jobs = [
-            job
-            for job in self.current_jobs
-            if job.status in [JobStatus.SUBMITTED, JobStatus.INITIAL_STATUS]
-        ]
-        return idle_jobs
+        return self._jobs_with_status(JobStatus.SUBMITTED, JobStatus.INITIAL_STATUS)
 
     @property
     def n_idle_jobs(self) -> int:
-        return len(self.idle_jobs)
+        return self._n_jobs_with_status(JobStatus.SUBMITTED, JobStatus.INITIAL_STATUS)
 
     @property
     def successful_jobs(self) -> list[Job]:
-        return [
-            job
-            for job in self.current_jobs
-            if job.status == JobStatus.CONCLUDED and job.get_results() is not None
-        ]
+        return self._jobs_with_status(JobStatus.CONCLUDED)
 
     @property
     def n_successful_jobs(self) -> int:
-        return len(self.successful_jobs)
+        return self._n_jobs_with_status(JobStatus.CONCLUDED)
+
+    def pop_new_successful_jobs(self) -> list[Job]:
+        """Get the jobs that succeeded since the last call of this method."""
+        with self._jobs_by_status_lock:
+            jobs = self._new_successful_jobs
+            self._new_successful_jobs = []
+        return jobs
 
     @property
     def failed_jobs(self) -> list[Job]:
-        return [
-            job
-            for job in self.completed_jobs
-            if job.status == JobStatus.FAILED
-            or (
-                job.get_results() is None
-                and job.status != JobStatus.CONCLUDED_WITHOUT_RESULTS
-            )
-        ]
+        return self._jobs_with_status(JobStatus.FAILED)
 
     @property
     def n_failed_jobs(self) -> int:
-        return len(self.failed_jobs)
+        return self._n_jobs_with_status(JobStatus.FAILED)
 
     @property
     def n_total_jobs(self) -> int:
@@ -230,27 +265,43 @@ class ClusterSubmission(ABC):
                 self._submit(job)
 
     def _submit(self, job: Job) -> None:
+        self._submit_batch([job])
+
+    def _submit_batch(self, jobs: list[Job]) -> None:
         logger = logging.getLogger("cluster_utils")
-        if job.cluster_id is not None and not job.waiting_for_resume:
-            raise RuntimeError("Can not run a job that already ran")
-        if job not in self.jobs:
-            logger.warning(
-                "Submitting job that was not yet added to the cluster system interface,"
-                " will add it now"
-            )
-            self.add_jobs(job)
-        cluster_id = self.submit_fn(job)
-        job.cluster_id = cluster_id
-        job.status = JobStatus.SUBMITTED
-
-        if job.waiting_for_resume:
-            logger.info(
-                "Job with id %d re-submitted with cluster id %s", job.id, job.cluster_id
-            )
+        for job in jobs:
+            if job.cluster_id is not None and not job.waiting_for_resume:
+                raise RuntimeError("Can not run a job that already ran")
+            if self._jobs_by_id.get(job.id) is not job:
+                logger.warning(
+                    "Submitting job that was not yet added to the cluster system"
+                    " interface, will add it now"
+                )
+                self.add_jobs(job)
+
+        if len(jobs) == 1:
+            cluster_ids = [self.submit_fn(jobs[0])]
         else:
-            logger.info(
-                "Job with id %d submitted with cluster id %s", job.id, job.cluster_id
-            )
+            cluster_ids = self.submit_batch_fn(jobs)
+
+        for job, cluster_id in zip(jobs, cluster_ids):
+            if job.cluster_id is None:
+                self._n_submitted_jobs += 1
+            job.cluster_id = cluster_id
+            job.status = JobStatus.SUBMITTED
+
+            if job.waiting_for_resume:
+                logger.info(
+                    "Job with id %d re-submitted with cluster id %s",
+                    job.id,
+                    job.cluster_id,
+                )
+            else:
+                logger.info(
+                    "Job with id %d submitted with cluster id %s",
+                    job.id,
+                    job.cluster_id,
+                )
 
     def resume(self, job: Job) -> None:
         """Resume a job that was terminated with :func:`~cluster_utils.exit_for_resume`."""
@@ -309,6 +360,15 @@ class ClusterSubmission(ABC):
     def submit_fn(self, job: Job) -> ClusterJobId:
         raise NotImplementedError
 
+    def submit_batch_fn(self, jobs: Sequence[Job]) -> list[ClusterJobId]:
+        """Submit multiple jobs to the cluster system.
+
+        Returns the cluster ids of the jobs in the same order as the jobs.  The default
+        implementation simply calls :meth:`submit_fn` for each job.  Overwrite this
+        method for cluster systems where submitting several jobs at once is cheaper.
+        """
+        return [self.submit_fn(job) for job in jobs]
+
     @abstractmethod
     def stop_fn(self, cluster_id: ClusterJobId) -> None:
         raise NotImplementedError
@@ -36,6 +36,11 @@ class CommunicationServer:
         self.port = None
         self.cluster_system = cluster_system
 
+        #: Set whenever a message from a job has been handled (or a job has been marked
+        #: as failed by the server).  The job manager waits on this instead of polling
+        #: the job states in fixed intervals.
+        self.job_state_changed = threading.Event()
+
         self.handlers = {
             MessageTypes.JOB_STARTED: self.handle_job_started,
             MessageTypes.ERROR_ENCOUNTERED: self.handle_error_encountered,
@@ -104,7 +109,7 @@ class CommunicationServer:
         job.status = JobStatus.RUNNING
         job.hostname = hostname
         if not job.waiting_for_resume:
-            job.start_time = time.time()
+            job.start_time = time.monotonic()
         job.waiting_for_resume = False
 
     def handle_error_encountered(self, message):
@@ -129,16 +134,18 @@ class CommunicationServer:
                 "Received a results-message from a job that is not listed in the"
                 " cluster interface system"
             )
+        # set the results before changing the status, so that a job is never seen as
+        # concluded without results
+        job.metrics = metrics
+        job.set_results()
+        if job.get_results() is None:
+            raise ValueError("Job sent metrics but something went wrong")
         if job.status == JobStatus.CONCLUDED_WITHOUT_RESULTS:
             job.status = JobStatus.CONCLUDED
             logger.info(f"Job {job_id} now sent results after concluding earlier.")
         else:
             job.status = JobStatus.SENT_RESULTS
             logger.info(f"Job {job_id} sent results.")
-        job.metrics = metrics
-        job.set_results()
-        if job.get_results() is None:
-            raise ValueError("Job sent metrics but something went wrong")
 
     def handle_job_concluded(self, message):
         logger = logging.getLogger("cluster_utils")
@@ -165,6 +172,7 @@ class CommunicationServer:
                         f" {constants.CONCLUDED_WITHOUT_RESULTS_GRACE_TIME_IN_SECS} seconds."
                         " Considering job failed."
                     )
+                    self.job_state_changed.set()
 
             # We give the job some time to send its results and fail it otherwise.
             self.event_loop.call_later(
@@ -193,7 +201,7 @@ class CommunicationServer:
         job = self.cluster_system.get_job(job_id)
         if 0 < percentage_done <= 1:
             job.estimated_end = (
-                job.start_time + (time.time() - job.start_time) / percentage_done
+                job.start_time + (time.monotonic() - job.start_time) / percentage_done
             )
 
     def handle_metric_early_report(self, message):
@@ -214,7 +222,10 @@ class CommunicationServer:
         msg_type_idx, message = pickle.loads(pickled_data)
 
         if msg_type_idx in self.handlers:
-            self.handlers[msg_type_idx](message)
+            try:
+                self.handlers[msg_type_idx](message)
+            finally:
+                self.job_state_changed.set()
         else:
             logger = logging.getLogger("cluster_utils")
             logger.error(
@@ -5,9 +5,9 @@ from __future__ import annotations
 import logging
 import os
 import subprocess
+import time
 from collections import namedtuple
 from contextlib import suppress
-from copy import copy
 from subprocess import PIPE, run
 from typing import Any, Sequence
 
@@ -18,6 +18,10 @@ from .job import Job
 
 MPI_CLUSTER_MAX_NUM_TOKENS = 10000
 
+#: Number of bytes at the end of a job's HTCondor log file that are searched for the
+#: return value of the job (the termination event is always at the end of the file).
+CONDOR_LOG_TAIL_SIZE = 4096
+
 MPI_CLUSTER_RUN_SCRIPT = f"""#!/bin/bash
 # Submission ID %(id)d
 
@@ -86,6 +90,10 @@ CondorRecord = namedtuple(
 
 
 class CondorClusterSubmission(ClusterSubmission):
+    #: Minimum duration between checks for failing jobs (each check reads the log files
+    #: of all waiting jobs, so avoid doing this multiple times per second)
+    CHECK_FOR_FAILURES_INTERVAL_SEC = 5
+
     def __init__(
         self,
         requirements: dict[str, Any],  # TODO can this be more specific than Any?
@@ -97,12 +105,67 @@ class CondorClusterSubmission(ClusterSubmission):
         os.environ["MPLBACKEND"] = "agg"
         self._process_requirements(requirements)
 
+        #: Time stamp (of the monotonic clock) of the last time checking for errors
+        self._last_time_checking_for_failures = -float("inf")
+
     def submit_fn(self, job: Job) -> ClusterJobId:
-        logger = logging.getLogger("cluster_utils")
         self.generate_job_spec_file(job)
-        submit_cmd = "condor_submit_bid {} {}\n".format(
-            self.bid, job.job_spec_file_path
+        assert job.job_spec_file_path is not None
+        submitted_line = self._condor_submit(job.job_spec_file_path, f"id {job.id}")
+        new_cluster_id = submitted_line.split(" ")[-1][:-1]
+
+        return ClusterJobId(new_cluster_id)
+
+    def submit_batch_fn(self, jobs: Sequence[Job]) -> list[ClusterJobId]:
+        # Submit all jobs with a single call of condor_submit_bid (calling it is
+        # relatively slow).  For this, the job spec files are concatenated into one
+        # submit description with one "queue" statement per job.  All jobs end up in
+        # the same cluster, with process ids in the order of the queue statements.
+        spec_contents = []
+        for job in jobs:
+            self.generate_job_spec_file(job)
+            assert job.job_spec_file_path is not None
+            with open(job.job_spec_file_path) as f:
+                spec_contents.append(f.read())
+
+        batch_spec_file_path = os.path.join(
+            self.submission_dir, f"batch_{jobs[0].id}-{jobs[-1].id}.sub"
         )
+        with open(batch_spec_file_path, "w") as f:
+            f.write("\n".join(spec_contents))
+
+        ids_str = f"ids {jobs[0].id}-{jobs[-1].id}"
+        submitted_line = self._condor_submit(batch_spec_file_path, ids_str)
+        # the line has the form "N job(s) submitted to cluster X."
+        n_submitted, *_, cluster = submitted_line.split(" ")
+        cluster = cluster[:-1]
+        if n_submitted != str(len(jobs)):
+            logger = logging.getLogger("cluster_utils")
+            logger.error(
+                "Submitted %d jobs (%s) to condor cluster, but condor reported %s"
+                " submitted jobs.",
+                len(jobs),
+                ids_str,
+                n_submitted,
+            )
+            self.close()
+            raise RuntimeError("Cluster submission failed")
+        os.remove(batch_spec_file_path)
+
+        return [ClusterJobId(f"{cluster}.{i}") for i in range(len(jobs))]
+
+    def _condor_submit(self, job_spec_file_path: str, jobs_str: str) -> str:
+        """Submit the given job spec file.
+
+        Args:
+            job_spec_file_path: The submit description file.
+            jobs_str: Description of the submitted jobs for log messages.
+
+        Returns:
+            The line of the output of condor_submit_bid that reports the submission.
+        """
+        logger = logging.getLogger("cluster_utils")
+        submit_cmd = "condor_submit_bid {} {}\n".format(self.bid, job_spec_file_path)
         for try_number in range(10):
             if try_number == 9:
                 logging.exception("Job aborted, cluster unstable.")
@@ -121,7 +184,7 @@ class CondorClusterSubmission(ClusterSubmission):
                 submit_output = result.stdout.decode("utf-8")
                 break
             except subprocess.TimeoutExpired:
-                logger.warning(f"Job submission for id {job.id} hangs. Retrying...")
+                logger.warning(f"Job submission for {jobs_str} hangs. Retrying...")
 
         good_lines = [line for line in submit_output.split("\n") if "submitted" in line]
         bad_lines = [
@@ -131,7 +194,7 @@ class CondorClusterSubmission(ClusterSubmission):
         ]
         if not good_lines or bad_lines:
             logger.error(
-                f"Job with id {job.id} submitted to condor cluster, but job submission"
+                f"Job with {jobs_str} submitted to condor cluster, but job submission"
                 f" failed. Submission output:\n{submit_output}"
             )
             print(bad_lines)
@@ -139,13 +202,11 @@ class CondorClusterSubmission(ClusterSubmission):
             raise RuntimeError("Cluster submission failed")
 
         assert len(good_lines) == 1
-        new_cluster_id = good_lines[0].split(" ")[-1][:-1]
-
-        return ClusterJobId(new_cluster_id)
+        return good_lines[0]
 
     def stop_fn(self, cluster_id: ClusterJobId) -> None:
-        cmd = "condor_rm {}".format(cluster_id)
-        run([cmd], shell=True, stderr=PIPE, stdout=PIPE)
+        cmd = ["condor_rm", cluster_id]
+        run(cmd, stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
 
     def resume_fn(self, job: Job) -> None:
         # On HTCondor the restarting is handled by the scheduler itself (due to
@@ -154,22 +215,24 @@ class CondorClusterSubmission(ClusterSubmission):
         pass
 
     def is_ready_to_check_for_failed_jobs(self) -> bool:
-        # TODO: should we throttle this a bit?  Probably doesn't need to be checked
-        # multiple times per second
-        return True
+        time_since_last_check = time.monotonic() - self._last_time_checking_for_failures
+        return time_since_last_check >= self.CHECK_FOR_FAILURES_INTERVAL_SEC
 
     def mark_failed_jobs(self, jobs: Sequence[Job]) -> None:
         for job in jobs:
             assert job.run_script_path is not None
 
-            # read condor log file to check the return code
+            # read end of condor log file to check the return code
             log_file = f"{job.run_script_path}.log"
             with suppress(FileNotFoundError):
-                with open(log_file) as f:
-                    content = f.read()
-                _, __, after = content.rpartition("return value ")
+                tail = _read_file_tail(log_file, CONDOR_LOG_TAIL_SIZE)
+                _, __, after = tail.rpartition("return value ")
 
                 if after and after[0] == "1":
+                    # the host is reported further up in the log, so only in case of
+                    # failure read the whole file
+                    with open(log_file) as f:
+                        content = f.read()
                     _, __, hostname = content.rpartition(
                         "Job executing on host: <172.22."
                     )
@@ -183,22 +246,34 @@ class CondorClusterSubmission(ClusterSubmission):
 
                     job.mark_failed(error_output)
 
+        self._last_time_checking_for_failures = time.monotonic()
+
     def generate_job_spec_file(self, job: Job) -> None:
         job_file_name = "job_{}_{}.sh".format(job.iteration, job.id)
         run_script_file_path = os.path.join(self.submission_dir, job_file_name)
         job_spec_file_path = os.path.join(self.submission_dir, job_file_name + ".sub")
         cmd = job.generate_execution_cmd(self.paths)
-        # Prepare namespace for string formatting (class vars + locals)
-        namespace = copy(vars(self))
-        namespace.update(vars(job))
-        namespace.update(locals())
+
+        template_vars = {
+            "id": job.id,
+            "cmd": cmd,
+            "opt_procedure_name": job.opt_procedure_name,
+            "run_script_file_path": run_script_file_path,
+            "job_spec_file_path": job_spec_file_path,
+            "cpus": self.cpus,
+            "gpus": self.gpus,
+            "mem": self.mem,
+            "requirements_line": self.requirements_line,
+            "concurrent_line": self.concurrent_line,
+            "extra_submission_lines": self.extra_submission_lines,
+        }
 
         with open(run_script_file_path, "w") as script_file:
-            script_file.write(MPI_CLUSTER_RUN_SCRIPT % namespace)
+            script_file.write(MPI_CLUSTER_RUN_SCRIPT % template_vars)
         os.chmod(run_script_file_path, 0o755)  # Make executable
 
         with open(job_spec_file_path, "w") as spec_file:
-            spec_file.write(MPI_CLUSTER_JOB_SPEC_FILE % namespace)
+            spec_file.write(MPI_CLUSTER_JOB_SPEC_FILE % template_vars)
 
         job.job_spec_file_path = job_spec_file_path
         job.run_script_path = run_script_file_path
@@ -286,3 +361,11 @@ class CondorClusterSubmission(ClusterSubmission):
             self.extra_submission_lines = f"# Extra options\n{extra_options}"
         else:
             self.extra_submission_lines = ""
+
+
+def _read_file_tail(path: str, size: int) -> str:
+    """Read the last ``size`` bytes of the given file."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - size))
+        return f.read().decode(errors="replace")
@@ -108,6 +108,16 @@ def best_params(df, params, metric, how_many, minimum=False):
 
 
 def best_jobs(df, metric, how_many, minimum=False):
+    if np.issubdtype(df[metric].dtype, np.number):
+        # only partially sorts the data, which is much cheaper than sorting the whole
+        # DataFrame when only a few of many jobs are requested
+        best = (
+            df.nsmallest(how_many, metric) if minimum else df.nlargest(how_many, metric)
+        )
+        # NaN values are skipped by nsmallest/nlargest, while sorting puts them last
+        if len(best) == min(how_many, len(df)):
+            return best
+
     sorted_df = df.sort_values([metric], ascending=minimum)
     return sorted_df.iloc[0:how_many]
 
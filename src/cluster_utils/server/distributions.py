@@ -242,7 +242,7 @@ class Discrete(Distribution):
             self.probs = list(np.array(self.probs) / probs_sum)
 
     def prepare_samples(self, howmany):
-        howmany = min(
+        howmany = max(
             10, howmany
         )  # HACK: for smart rounding a reasonable sample size is needed
         self.samples = np.random.choice(self.option_list, p=self.probs, size=howmany)
@@ -6,7 +6,6 @@ import concurrent.futures
 import logging
 import os
 import random
-from copy import copy
 from multiprocessing import cpu_count
 from subprocess import PIPE, run
 from typing import Any, Sequence
@@ -111,13 +110,15 @@ class DummyClusterSubmission(ClusterSubmission):
         job_file_name = "{}_{}.sh".format(job.iteration, job.id)
         run_script_file_path = os.path.join(self.submission_dir, job_file_name)
         cmd = job.generate_execution_cmd(self.paths)
-        # Prepare namespace for string formatting (class vars + locals)
-        namespace = copy(vars(self))
-        namespace.update(vars(job))
-        namespace.update(locals())
+
+        template_vars = {
+            "id": job.id,
+            "cmd": cmd,
+            "run_script_file_path": run_script_file_path,
+        }
 
         with open(run_script_file_path, "w") as script_file:
-            script_file.write(LOCAL_RUN_SCRIPT % namespace)
+            script_file.write(LOCAL_RUN_SCRIPT % template_vars)
         os.chmod(run_script_file_path, 0o755)  # Make executable
 
         job.run_script_path = run_script_file_path
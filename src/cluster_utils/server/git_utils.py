@@ -1,11 +1,9 @@
 import contextlib
+import functools
 import logging
 import os
-import sys
 from time import sleep
 
-import git
-
 from .cluster_system import ClusterSubmissionHook
 from .utils import rm_dir_full
 
@@ -33,11 +31,23 @@ def sanitize_for_latex(string):
     return sanitized
 
 
+@functools.lru_cache(maxsize=None)
+def _git():
+    """Import and return the ``git`` module of GitPython.
+
+    git is only imported when it is actually needed, so that runs that don't use git
+    (e.g. with run_in_working_dir) don't have to pay for importing it.
+    """
+    import git
+
+    return git
+
+
 def get_git_url():
     logger = logging.getLogger("cluster_utils")
     try:
-        repo = git.Repo(search_parent_directories=True)
-    except git.exc.InvalidGitRepositoryError:
+        repo = _git().Repo(search_parent_directories=True)
+    except _git().exc.InvalidGitRepositoryError:
         return None
 
     url_list = list(repo.remotes.origin.urls)
@@ -59,7 +69,7 @@ def make_git_params(user_git_params, local_path):
     if "url" not in git_params:
         auto_url = get_git_url()
         if not auto_url:
-            raise git.exc.InvalidGitRepositoryError(
+            raise _git().exc.InvalidGitRepositoryError(
                 "No git repository given in json file or auto-detected"
             )
 
@@ -87,9 +97,6 @@ class GitConnector(object):
         self._repo = None
         self._remove_local_copy = remove_local_copy
 
-        if "git" not in sys.modules:
-            return
-
         # make local copy of repo
         if self._orig_url is not None:
             self._make_local_copy(branch, depth, commit)
@@ -102,7 +109,7 @@ class GitConnector(object):
         :return: None
         """
         # Here we ignore the exception, should not affect of execution of the script
-        with contextlib.suppress(git.exc.InvalidGitRepositoryError):
+        with contextlib.suppress(_git().exc.InvalidGitRepositoryError):
             self._repo = self._connect_local_repo(self._local_path)
 
     def _connect_local_repo(self, local_path):
@@ -111,17 +118,16 @@ class GitConnector(object):
         :param path: path to local repo
         :return: git.Repo object
         """
-
         repo = None
         try:
-            repo = git.Repo(path=local_path, search_parent_directories=True)
-        except git.exc.InvalidGitRepositoryError as e:
+            repo = _git().Repo(path=local_path, search_parent_directories=True)
+        except _git().exc.InvalidGitRepositoryError as e:
             path = os.getcwd() if self._local_path is None else self._local_path
             msg = (
                 "Could not find git repository at localtion {} or any of the parent"
                 " directories".format(path)
             )
-            raise git.exc.InvalidGitRepositoryError(msg) from e
+            raise _git().exc.InvalidGitRepositoryError(msg) from e
         except Exception:
             raise
 
@@ -192,7 +198,6 @@ class GitConnector(object):
         :param commit: checkout particular commit
         :return: None
         """
-
         remote_url = self._orig_url
         logger = logging.getLogger("cluster_utils")
 
@@ -200,7 +205,7 @@ class GitConnector(object):
         if os.path.exists(self._orig_url):
             try:
                 local_repo = self._connect_local_repo(self._orig_url)
-            except git.exc.InvalidGitRepositoryError:
+            except _git().exc.InvalidGitRepositoryError:
                 raise
 
             try:
@@ -220,7 +225,7 @@ class GitConnector(object):
             f" {commit if commit else 'latest'} ... "
         )
 
-        cloned_repo = git.Repo.clone_from(
+        cloned_repo = _git().Repo.clone_from(
             remote_url, self._local_path, branch=branch, depth=depth
         )
 
@@ -228,7 +233,7 @@ class GitConnector(object):
             try:
                 # Hard reset HEAD to specific commit
                 cloned_repo.head.reset(commit=commit, working_tree=True)
-            except git.exc.GitCommandError as e:
+            except _git().exc.GitCommandError as e:
                 raise RuntimeError(
                     f"Commit {commit} failed as a valid revision. "
                     f"Maybe it is not reachable within depth {depth}?"
@@ -240,7 +245,7 @@ class GitConnector(object):
             logger.info("Remove local git clone in {} ... ".format(self._local_path))
             self._repo.close()
             sleep(1.0)
-            git.rmtree(self._local_path)
+            _git().rmtree(self._local_path)
             rm_dir_full(self._local_path)
 
     @property
@@ -293,7 +298,9 @@ class ClusterSubmissionGitHook(ClusterSubmissionHook):
         else:
             # Check if local Path is git repo
             try:
-                git.Repo(path=self.params["local_path"], search_parent_directories=True)
+                _git().Repo(
+                    path=self.params["local_path"], search_parent_directories=True
+                )
                 self.state = 0
             except Exception:
                 pass
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import ast
+import csv
 import logging
+import math
+import numbers
 import os
 import pathlib
+import re
 import time
-from copy import deepcopy
-from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from cluster_utils.base import constants
 from cluster_utils.base.utils import flatten_nested_string_dict
 
-from .utils import dict_to_dirname, update_recursive
+from .utils import clone_nested_settings, dict_to_dirname, update_recursive
 
 if TYPE_CHECKING:
     import concurrent.futures
@@ -21,6 +26,46 @@ if TYPE_CHECKING:
     from .settings import SingularitySettings
 
 
+#: Matches the repr of numpy scalars (e.g. ``np.float64(0.1)`` with numpy >= 2).
+_NUMPY_SCALAR_REPR = re.compile(r"np\.\w+\(([^()]*)\)")
+
+
+def _stored_param_matches(text: str, value: Any) -> bool:
+    """Check if a value in the parameter file written by the client matches value."""
+    if isinstance(value, str):
+        # strings are written as they are
+        return text == value
+    try:
+        stored_value = ast.literal_eval(_NUMPY_SCALAR_REPR.sub(r"\1", text))
+    except (ValueError, SyntaxError):
+        return False
+    return _param_values_equal(stored_value, value)
+
+
+def _param_values_equal(stored_value: Any, value: Any) -> bool:
+    """Compare a parsed parameter value with the value of a job setting.
+
+    Numbers are compared with a tolerance and lists and tuples are considered equal, as
+    the exact representation may change when writing and reading the parameter file.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (list, tuple)):
+        return (
+            isinstance(stored_value, (list, tuple))
+            and len(stored_value) == len(value)
+            and all(map(_param_values_equal, stored_value, value))
+        )
+    if (
+        isinstance(value, numbers.Real)
+        and isinstance(stored_value, numbers.Real)
+        and not isinstance(value, bool)
+        and not isinstance(stored_value, bool)
+    ):
+        return math.isclose(stored_value, value, rel_tol=1e-9)
+    return stored_value == value
+
+
 class JobStatus:
     INITIAL_STATUS = -1
     SUBMITTED = 0
@@ -56,27 +101,37 @@ class Job:
         self.run_script_path: Optional[str] = None
         self.hostname: Optional[str] = None
         self.waiting_for_resume = False
-        self.start_time = None
-        self.estimated_end = None
+        #: Time stamps (of the monotonic clock) of the start and the estimated end
+        self.start_time: Optional[float] = None
+        self.estimated_end: Optional[float] = None
         self.iteration = iteration
         self.comm_server_info = {
             constants.ID: id,
             "ip": connection_info["ip"],
             "port": connection_info["port"],
         }
-        self.status = JobStatus.INITIAL_STATUS
+        #: Called with ``(job, old_status, new_status)`` whenever the status of the job
+        #: changes.  Set by the cluster system when the job is added to it.
+        self.status_listener: Optional[Callable[[Job, int, int], None]] = None
+        self._status = JobStatus.INITIAL_STATUS
         self.metrics = None
         self.error_info: Optional[str] = None
         self.resulting_df = None
+        #: Flattened final settings of the job (including the job id), set together
+        #: with the data frames in :meth:`set_results`.
+        self.flattened_params: Optional[dict[str, Any]] = None
         self.param_df = None
         self.metric_df = None
+        # sorted column names of param_df and metric_df (set in set_results)
+        self._param_columns: Optional[tuple[str, ...]] = None
+        self._metric_columns: Optional[tuple[str, ...]] = None
         self.reported_metric_values: list[Any] = []  # FIXME what is the expected type?
         self.futures_object: Optional[concurrent.futures.Future] = None
         self.opt_procedure_name = opt_procedure_name
         self.singularity_settings = singularity_settings
 
     def generate_final_setting(self, paths):
-        current_setting = deepcopy(self.settings)
+        current_setting = clone_nested_settings(self.settings)
         update_recursive(current_setting, self.other_params)
         job_res_dir = dict_to_dirname(current_setting, self.id, smart_naming=False)
         current_setting[constants.WORKING_DIR] = os.path.join(
@@ -101,7 +156,7 @@ class Job:
         logger = logging.getLogger("cluster_utils")
         current_setting = self.generate_final_setting(paths)
 
-        set_cwd = "cd {}".format(paths["main_path"])
+        set_cwd = f"cd {paths['main_path']}"
 
         if "variables" in paths:
             if not isinstance(paths["variables"], dict):
@@ -125,8 +180,8 @@ class Job:
             pre_job_script = ""
 
         if "virtual_env_path" in paths:
-            virtual_env_activate = "source {}".format(
-                os.path.join(paths["virtual_env_path"], "bin/activate")
+            virtual_env_activate = (
+                f"source {os.path.join(paths['virtual_env_path'], 'bin/activate')}"
             )
         else:
             virtual_env_activate = ""
@@ -155,17 +210,14 @@ class Job:
 
         self.final_settings = current_setting
 
+        comm_server_info = self.comm_server_info
         arguments = (
-            "--job-id={job_id}"
-            " --cluster-utils-server={ip}:{port}"
-            ' --parameter-dict "{current_setting}"'
-        ).format(
-            job_id=self.comm_server_info[constants.ID],
-            ip=self.comm_server_info["ip"],
-            port=self.comm_server_info["port"],
-            current_setting=current_setting,
+            f"--job-id={comm_server_info[constants.ID]}"
+            f" --cluster-utils-server={comm_server_info['ip']}:{comm_server_info['port']}"
+            f' --parameter-dict "{current_setting}"'
         )
 
+        script_path = os.path.join(paths["main_path"], paths["script_to_run"])
         if is_python_script:
             run_script_as_module_main = paths.get("run_as_module", False)
             if run_script_as_module_main:
@@ -175,10 +227,8 @@ class Job:
                 )
                 exec_cmd = f"{python_executor} -m {module_name} {arguments}"
             else:
-                script_path = os.path.join(paths["main_path"], paths["script_to_run"])
                 exec_cmd = f"{python_executor} {script_path} {arguments}"
         else:
-            script_path = os.path.join(paths["main_path"], paths["script_to_run"])
             exec_cmd = f"{script_path} {arguments}"
 
         if self.singularity_settings:
@@ -257,9 +307,14 @@ class Job:
     def set_results(self):
         flattened_params = dict(flatten_nested_string_dict(self.final_settings))
         flattened_params[constants.ID] = self.id
+        self.flattened_params = flattened_params
         self.param_df = pd.DataFrame([flattened_params])
         self.metric_df = pd.DataFrame([self.metrics])
         self.resulting_df = pd.concat([self.param_df, self.metric_df], axis=1)
+        # get_results is called very often (e.g. when counting successful jobs), so
+        # compute the sorted column names only once here
+        self._param_columns = tuple(sorted(self.param_df.columns))
+        self._metric_columns = tuple(sorted(self.metric_df.columns))
 
     def try_load_results_from_filesystem(self, paths):
         logger = logging.getLogger("cluster_utils")
@@ -267,6 +322,12 @@ class Job:
 
         possible_metric_file = os.path.join(working_dir, constants.CLUSTER_METRIC_FILE)
         if os.path.isfile(possible_metric_file):
+            if not self._stored_params_match_settings(working_dir):
+                logger.info(
+                    f"Job {self.id}: Results in {working_dir} were produced with"
+                    " different settings.  Will run the job again."
+                )
+                return
             metric_df = pd.read_csv(possible_metric_file)
             self.metrics = {
                 column: metric_df[column].iloc[0] for column in metric_df.columns
@@ -279,14 +340,46 @@ class Job:
             self.set_results()
             self.status = JobStatus.CONCLUDED
 
+    def _stored_params_match_settings(self, working_dir: str) -> bool:
+        """Check if the parameters saved in working_dir match the settings of the job.
+
+        The results in the working directory of a job id may have been produced with
+        different settings, e.g. if the run was started with a version of cluster_utils
+        that assigned the settings to the job ids in a different order.
+        """
+        param_file = os.path.join(working_dir, constants.CLUSTER_PARAM_FILE)
+        if not os.path.isfile(param_file):
+            return False
+        with open(param_file, newline="") as f:
+            stored_params = next(csv.DictReader(f), None)
+        if stored_params is None:
+            return False
+
+        return all(
+            name in stored_params and _stored_param_matches(stored_params[name], value)
+            for name, value in flatten_nested_string_dict(self.settings)
+        )
+
+    @property
+    def status(self) -> int:
+        """Current status of the job (see :class:`JobStatus`)."""
+        return self._status
+
+    @status.setter
+    def status(self, status: int) -> None:
+        old_status = self._status
+        self._status = status
+        if self.status_listener is not None and status != old_status:
+            self.status_listener(self, old_status, status)
+
     def get_results(self):
-        if self.resulting_df is None or self.param_df is None or self.metric_df is None:
+        if (
+            self.resulting_df is None
+            or self._param_columns is None
+            or self._metric_columns is None
+        ):
             return None
-        return (
-            self.resulting_df,
-            tuple(sorted(self.param_df.columns)),
-            tuple(sorted(self.metric_df.columns)),
-        )
+        return (self.resulting_df, self._param_columns, self._metric_columns)
 
     def mark_failed(self, error_message: str) -> None:
         """Mark the job as failed.
@@ -305,7 +398,7 @@ class Job:
     @property
     def time_left(self):
         if self.estimated_end is not None:
-            return self.estimated_end - time.time()
+            return self.estimated_end - time.monotonic()
         return None
 
     @staticmethod
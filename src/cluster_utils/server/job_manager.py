@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import concurrent.futures
 import datetime
 import logging
 import logging.handlers
+import multiprocessing
 import os
+import pickle
 import shutil
 import sys
-import time
 from contextlib import ExitStack
+from typing import Any, Callable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -30,10 +33,13 @@ from .user_interaction import InteractiveMode, NonInteractiveMode
 from .utils import (
     ClusterRunType,
     SignalWatcher,
+    copy_file_reflink,
     log_and_print,
     make_red,
     process_other_params,
+    rm_dir_async,
     rm_dir_full,
+    rm_dirs_async,
     save_metadata,
     save_report_data,
 )
@@ -65,11 +71,11 @@ def ensure_empty_dir(dir_name, defensive=False):
             print(make_red(f"Directory {dir_name} exists. Delete everything? (y/N)"))
             ans = input()
             if ans.lower() == "y":
-                shutil.rmtree(dir_name, ignore_errors=True)
+                rm_dir_async(dir_name)
                 logger.info(f"Deleted old contents of {dir_name}")
                 os.makedirs(dir_name)
         else:
-            shutil.rmtree(dir_name, ignore_errors=True)
+            rm_dir_async(dir_name)
             logger.info(f"Deleted old contents of {dir_name}")
             os.makedirs(dir_name)
     else:
@@ -77,44 +83,52 @@ def ensure_empty_dir(dir_name, defensive=False):
         logger.info(f"Directory {dir_name} created")
 
 
-def dict_to_dirname(setting, job_id, smart_naming=True):
-    vals = [
-        "{}={}".format(str(key)[:3], str(value)[:6])
-        for key, value in setting.items()
-        if not isinstance(value, dict)
-    ]
-    res = "{}_{}".format(job_id, "_".join(vals))
-    if len(res) < 35 and smart_naming:
-        return res
-    return str(job_id)
-
-
 def update_best_job_datadirs(result_dir, working_dirs, remove_working_dirs=True):
     logger = logging.getLogger("cluster_utils")
     datadir = os.path.join(result_dir, "best_jobs")
     os.makedirs(datadir, exist_ok=True)
 
-    short_names = [
-        working_dir.split("_")[-1].replace("/", "_") for working_dir in working_dirs
-    ]
+    # name of the directory in datadir for each working directory
+    short_names = {
+        working_dir: working_dir.rpartition("_")[2].replace("/", "_")
+        for working_dir in working_dirs
+    }
 
-    # Copy over new best directories
-    for working_dir in working_dirs:
+    def copy_to_datadir(working_dir):
         if os.path.exists(working_dir):
-            new_dir_name = working_dir.split("_")[-1].replace("/", "_")
-            new_dir_full = os.path.join(datadir, new_dir_name)
+            new_dir_full = os.path.join(datadir, short_names[working_dir])
             if not os.path.exists((new_dir_full)):
-                shutil.copytree(working_dir, new_dir_full)
+                if remove_working_dirs:
+                    # the working directory is removed anyway, so simply move it
+                    # (much cheaper than copying all the data)
+                    try:
+                        os.rename(working_dir, new_dir_full)
+                        return
+                    except OSError:
+                        # e.g. if the directories are on different file systems
+                        pass
+                shutil.copytree(
+                    working_dir, new_dir_full, copy_function=copy_file_reflink
+                )
             if remove_working_dirs:
                 rm_dir_full(working_dir)
 
-    # Delete old best directories if outdated
-    for dir_or_file in os.listdir(datadir):
-        full_path = os.path.join(datadir, dir_or_file)
-        if os.path.isfile(full_path):
-            continue
-        if dir_or_file not in short_names:
-            rm_dir_full(full_path)
+    # Copying and removing is dominated by file system access, so process the
+    # (independent) directories in parallel threads.
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        # Copy over new best directories
+        list(executor.map(copy_to_datadir, working_dirs))
+
+        # Delete old best directories if outdated
+        best_dir_names = set(short_names.values())
+        # (scandir provides the file type without an extra stat call per entry)
+        with os.scandir(datadir) as entries:
+            outdated_dirs = [
+                entry.path
+                for entry in entries
+                if not entry.is_file() and entry.name not in best_dir_names
+            ]
+        list(executor.map(rm_dir_full, outdated_dirs))
 
     logger.info(f"Best jobs in directory {datadir} updated.")
 
@@ -223,6 +237,29 @@ def pre_opt(
     return hp_optimizer, cluster_interface, comm_server, processed_other_params
 
 
+def wait_for_job_state_change(
+    comm_server: CommunicationServer, wait_time: float, busy: bool
+) -> float:
+    """Wait until a job changes its state or ``wait_time`` has passed.
+
+    Args:
+        comm_server: Communication server that receives the messages from the jobs.
+        wait_time: Maximum time to wait (in seconds).
+        busy: Whether the job manager still has work to do (e.g. jobs to submit).
+
+    Returns:
+        The wait time for the next call.  If a job changed its state or the job manager
+        is busy, this is the normal loop sleep time, otherwise the wait time is doubled
+        (up to ``JOB_MANAGER_MAX_IDLE_WAIT_TIME_IN_SECS``).
+    """
+    state_changed = comm_server.job_state_changed.wait(wait_time)
+    comm_server.job_state_changed.clear()
+
+    if state_changed or busy:
+        return constants.JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS
+    return min(2 * wait_time, constants.JOB_MANAGER_MAX_IDLE_WAIT_TIME_IN_SECS)
+
+
 def post_opt(cluster_interface):
     cluster_interface.exec_post_run_routines()
     cluster_interface.close()
@@ -233,6 +270,11 @@ def pre_iteration_opt(base_paths_and_files):
     pass
 
 
+#: Clean-ups of working directories that have to wait for a report generated in the
+#: background, together with the future of that report.
+PendingCleanups = List[Tuple[concurrent.futures.Future, Callable[[], None]]]
+
+
 def post_iteration_opt(
     cluster_interface,
     hp_optimizer,
@@ -242,15 +284,24 @@ def post_iteration_opt(
     num_best_jobs_whose_data_is_kept,
     remove_working_dirs,
     generate_report: bool,
+    report_executor: Optional[concurrent.futures.Executor] = None,
+    pending_cleanups: Optional[PendingCleanups] = None,
 ):
+    if pending_cleanups is None:
+        pending_cleanups = []
+    # the best jobs' directories of the previous iteration have to be updated before the
+    # ones of this iteration
+    run_pending_cleanups(pending_cleanups)
+
     pdf_output = os.path.join(base_paths_and_files["result_dir"], "result.pdf")
     current_result_path = base_paths_and_files["current_result_dir"]
+    report_future: Optional[concurrent.futures.Future] = None
 
     submission_hook_stats = cluster_interface.collect_stats_from_hooks()
 
     jobs_to_tell = [
         job
-        for job in cluster_interface.successful_jobs
+        for job in cluster_interface.pop_new_successful_jobs()
         if not job.results_used_for_update
     ]
     hp_optimizer.tell(jobs_to_tell)
@@ -261,12 +312,24 @@ def post_iteration_opt(
         # conditional import as it depends on optional dependencies
         from .report import produce_optimization_report
 
-        produce_optimization_report(
-            hp_optimizer,
-            pdf_output,
-            submission_hook_stats,
-            current_result_path,
-        )
+        if report_executor is None:
+            produce_optimization_report(
+                hp_optimizer,
+                pdf_output,
+                submission_hook_stats,
+                current_result_path,
+            )
+        else:
+            # Generate the report in the background, so that the submission of jobs is
+            # not blocked.  The optimizer is pickled right away, as the original one is
+            # further modified in the meantime.
+            report_future = report_executor.submit(
+                _produce_optimization_report_from_pickle,
+                pickle.dumps(hp_optimizer, protocol=5),
+                pdf_output,
+                submission_hook_stats,
+                current_result_path,
+            )
 
     hp_optimizer.iteration += 1
 
@@ -277,18 +340,64 @@ def post_iteration_opt(
 
     comm_server.jobs = []
 
-    if num_best_jobs_whose_data_is_kept > 0:
-        best_working_dirs = hp_optimizer.best_jobs_working_dirs(
-            how_many=num_best_jobs_whose_data_is_kept
-        )
-        update_best_job_datadirs(
-            base_paths_and_files["result_dir"], best_working_dirs, remove_working_dirs
+    best_working_dirs = (
+        list(
+            hp_optimizer.best_jobs_working_dirs(
+                how_many=num_best_jobs_whose_data_is_kept
+            )
         )
+        if num_best_jobs_whose_data_is_kept > 0
+        else []
+    )
+    finished_working_dirs = (
+        list(hp_optimizer.full_df["working_dir"]) if remove_working_dirs else []
+    )
+
+    def clean_up_working_dirs():
+        if num_best_jobs_whose_data_is_kept > 0:
+            update_best_job_datadirs(
+                base_paths_and_files["result_dir"],
+                best_working_dirs,
+                remove_working_dirs,
+            )
+        rm_dirs_async(finished_working_dirs)
+
+    if report_future is None:
+        clean_up_working_dirs()
+    else:
+        # the report hooks may still read the working directories, so only move/remove
+        # them once the report is finished
+        pending_cleanups.append((report_future, clean_up_working_dirs))
 
-    if remove_working_dirs:
-        finished_working_dirs = hp_optimizer.full_df["working_dir"]
-        for working_dir in finished_working_dirs:
-            rm_dir_full(working_dir)
+
+def run_pending_cleanups(pending_cleanups: PendingCleanups) -> None:
+    """Wait for the reports generated in the background and clean up after them.
+
+    Errors of the report generation are only logged, errors of the clean-ups are
+    raised.
+    """
+    logger = logging.getLogger("cluster_utils")
+    while pending_cleanups:
+        report_future, clean_up = pending_cleanups.pop(0)
+        if report_future.exception() is not None:
+            logger.warning(
+                "Failed to generate PDF report", exc_info=report_future.exception()
+            )
+        clean_up()
+
+
+def cancel_pending_reports(pending_cleanups: PendingCleanups) -> None:
+    """Cancel the reports that are not generated yet (e.g. when aborting the run)."""
+    for report_future, _ in pending_cleanups:
+        report_future.cancel()
+
+
+def _produce_optimization_report_from_pickle(
+    optimizer_pickle: bytes, *args: Any
+) -> None:
+    from .report import produce_optimization_report
+
+    produce_optimization_report(pickle.loads(optimizer_pickle), *args)
 
 
 def hp_optimization(
@@ -357,6 +466,21 @@ def hp_optimization(
     interaction_mode = NonInteractiveMode if no_user_interaction else InteractiveMode
 
     with ExitStack() as stack:
+        # Reports of intermediate iterations are generated in a separate process, so
+        # that they neither block the loop below nor compete with it for the GIL.
+        # Processes are spawned instead of forked, as the communication server is
+        # running in a thread.
+        report_executor = None
+        pending_cleanups: PendingCleanups = []
+        if report_generation_mode is GenerateReportSetting.EVERY_ITERATION:
+            report_executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                )
+            )
+            # When the loop is aborted, do not wait for the reports that are not
+            # started yet.  (This runs before the executor is shut down.)
+            stack.callback(cancel_pending_reports, pending_cleanups)
         check_for_keyboard_input = stack.enter_context(
             interaction_mode(cluster_interface, comm_server)
         )
@@ -370,16 +494,25 @@ def hp_optimization(
         )
         # END with statements
 
+        # best value in hp_optimizer.full_df and the number of rows it was looked up at
+        best_value = None
+        n_results_at_best_value_lookup = 0
+
+        num_jobs_to_submit_per_iteration = 5
+        wait_time = constants.JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS
+        job_submitted = True
         while (
             cluster_interface.n_completed_jobs < number_of_samples
             and not signal_watcher.has_received_signal()
         ):
             check_for_keyboard_input()
-            time.sleep(constants.JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS)
+            wait_time = wait_for_job_state_change(
+                comm_server, wait_time, busy=job_submitted
+            )
 
             jobs_to_tell = [
                 job
-                for job in cluster_interface.successful_jobs
+                for job in cluster_interface.pop_new_successful_jobs()
                 if not job.results_used_for_update
             ]
             hp_optimizer.tell(jobs_to_tell)
@@ -400,29 +533,36 @@ def hp_optimization(
                 cluster_interface.n_completed_jobs // n_jobs_per_iteration
                 > current_iteration
             )
-            if (
-                n_jobs_submitted_cur_iteration < max_job_submissions
-                and cluster_interface.n_submitted_jobs < number_of_samples
-                and not iteration_finished
-            ):
-                new_settings = hp_optimizer.ask()
-                new_job = Job(
-                    id=cluster_interface.inc_job_id,
-                    settings=new_settings,
-                    other_params=processed_other_params,
-                    paths=base_paths_and_files,
-                    iteration=hp_optimizer.iteration + 1,
-                    connection_info=comm_server.connection_info,
-                    metric_to_watch=metric_to_optimize,
-                    opt_procedure_name=opt_procedure_name,
-                    singularity_settings=singularity_settings,
+            if not iteration_finished and not cluster_interface.has_unsubmitted_jobs():
+                # create the jobs of one submission batch at once, so that they can be
+                # submitted together.  Submitting at most a few jobs per loop cycle
+                # allows to stop early (see max_failed_jobs) if the jobs keep failing.
+                n_new_jobs = min(
+                    max_job_submissions - n_jobs_submitted_cur_iteration,
+                    number_of_samples - cluster_interface.n_submitted_jobs,
+                    num_jobs_to_submit_per_iteration,
                 )
-                if isinstance(hp_optimizer, NGOptimizer):
-                    hp_optimizer.add_candidate(new_job.id)
-                cluster_interface.add_jobs(new_job)
-
-            if cluster_interface.has_unsubmitted_jobs():
-                cluster_interface.submit_next()
+                new_jobs = []
+                for new_settings in hp_optimizer.ask_many(n_new_jobs):
+                    new_job = Job(
+                        id=cluster_interface.inc_job_id,
+                        settings=new_settings,
+                        other_params=processed_other_params,
+                        paths=base_paths_and_files,
+                        iteration=hp_optimizer.iteration + 1,
+                        connection_info=comm_server.connection_info,
+                        metric_to_watch=metric_to_optimize,
+                        opt_procedure_name=opt_procedure_name,
+                        singularity_settings=singularity_settings,
+                    )
+                    if isinstance(hp_optimizer, NGOptimizer):
+                        hp_optimizer.add_candidate(new_job.id)
+                    new_jobs.append(new_job)
+                cluster_interface.add_jobs(new_jobs)
+
+            job_submitted = cluster_interface.has_unsubmitted_jobs()
+            if job_submitted:
+                cluster_interface.submit_next_batch(num_jobs_to_submit_per_iteration)
 
             if iteration_finished:
                 post_iteration_opt(
@@ -436,6 +576,8 @@ def hp_optimization(
                     generate_report=(
                         report_generation_mode is GenerateReportSetting.EVERY_ITERATION
                     ),
+                    report_executor=report_executor,
+                    pending_cleanups=pending_cleanups,
                 )
                 logger.info(f"starting new iteration: {hp_optimizer.iteration}")
                 pre_iteration_opt(base_paths_and_files)
@@ -446,7 +588,7 @@ def hp_optimization(
             max_failed_jobs = (
                 cluster_interface.n_successful_jobs
                 + cluster_interface.n_running_jobs
-                + 5
+                + num_jobs_to_submit_per_iteration
             )
             if cluster_interface.n_failed_jobs > max_failed_jobs:
                 cluster_interface.close()
@@ -468,12 +610,13 @@ def hp_optimization(
             best_seen_metric = cluster_interface.get_best_seen_value_of_main_metric(
                 minimize=minimize
             )
-            if len(hp_optimizer.full_df) > 0:
+            # full_df (which is sorted by the metric) only changes when new results are
+            # added, so only look up the best value in that case
+            if len(hp_optimizer.full_df) != n_results_at_best_value_lookup:
+                n_results_at_best_value_lookup = len(hp_optimizer.full_df)
                 best_value = hp_optimizer.full_df[hp_optimizer.metric_to_optimize].iloc[
                     0
                 ]
-            else:
-                best_value = None
 
             estimates = [
                 item for item in [best_seen_metric, best_value] if item is not None
@@ -489,6 +632,10 @@ def hp_optimization(
                     **early_killing_params,
                 )
 
+        if not signal_watcher.has_received_signal():
+            # the final report below has to be written after the pending ones
+            run_pending_cleanups(pending_cleanups)
+
     print()  # empty line after progress bars
 
     if signal_watcher.has_received_signal():
@@ -515,7 +662,7 @@ def hp_optimization(
     post_opt(cluster_interface)
 
     if remove_working_dirs:
-        rm_dir_full(base_paths_and_files["current_result_dir"])
+        rm_dir_async(base_paths_and_files["current_result_dir"])
 
 
 def kill_bad_looking_jobs(
@@ -536,6 +683,16 @@ def kill_bad_looking_jobs(
     if len(intermediate_results) < 5:
         return
 
+    # If a job runs more than half of its runtime, don't kill it
+    candidates = [
+        job
+        for job in cluster_interface.running_jobs
+        if job.reported_metric_values
+        and len(job.reported_metric_values) <= max_len // 2
+    ]
+    if not candidates:
+        return
+
     intermediate_results_np = np.array(intermediate_results)
     sign = 1 if minimize else -1
     intermediate_ranks = np.argsort(
@@ -545,24 +702,20 @@ def kill_bad_looking_jobs(
         np.mean((intermediate_ranks - intermediate_ranks[:, -1:]) ** 2, axis=0)
     )
 
-    for job in cluster_interface.running_jobs:
-        if not job.reported_metric_values:
-            continue
-        if len(job.reported_metric_values) > intermediate_results_np.shape[1] // 2:
-            # If a job runs more than half of its runtime, don't kill it
-            continue
-        index, value = (
-            len(job.reported_metric_values) - 1,
-            np.array(job.reported_metric_values[-1]),
-        )
-        all_values = np.concatenate(
-            [intermediate_results_np[:, index], value.reshape(1)]
-        )
-        rank_of_current_job = np.argsort(np.argsort(all_values * sign))[-1]
-        if rank_of_current_job - how_many_stds * rank_deviations[index] > target_rank:
+    # Rank all candidates at once: the rank of a job among the finished ones is the
+    # number of finished jobs that had a better value at the same point.
+    indices = np.array([len(job.reported_metric_values) - 1 for job in candidates])
+    values = [job.reported_metric_values[-1] for job in candidates]
+    ranks = np.count_nonzero(
+        intermediate_results_np[:, indices] * sign < np.array(values) * sign, axis=0
+    )
+    to_kill = ranks - how_many_stds * rank_deviations[indices] > target_rank
+
+    for job, value, kill in zip(candidates, values, to_kill):
+        if kill:
             job.metrics = {metric_to_optimize: float(value)}
-            job.status = JobStatus.CONCLUDED
             job.set_results()
+            job.status = JobStatus.CONCLUDED
             cluster_interface.stop_fn(job.cluster_id)
 
 
@@ -629,8 +782,17 @@ def grid_search(
 
     if load_existing_results:
         logger.info("Trying to load existing results")
-        for job in jobs:
-            job.try_load_results_from_filesystem(base_paths_and_files)
+        # loading is dominated by file system access, so do it in parallel threads
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            # consume the iterator, so that exceptions are propagated
+            list(
+                executor.map(
+                    lambda job: job.try_load_results_from_filesystem(
+                        base_paths_and_files
+                    ),
+                    jobs,
+                )
+            )
 
     interaction_mode = NonInteractiveMode if no_user_interaction else InteractiveMode
     with ExitStack() as stack:
@@ -646,19 +808,14 @@ def grid_search(
         # END with statements
 
         num_jobs_to_submit_per_iteration = 5
+        wait_time = constants.JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS
         while (
             not signal_watcher.has_received_signal()
             and cluster_interface.n_completed_jobs != len(jobs)
         ):
             # submit next batch of jobs
-            i = 0
-            while (
-                not signal_watcher.has_received_signal()
-                and cluster_interface.has_unsubmitted_jobs()
-                and i < num_jobs_to_submit_per_iteration
-            ):
-                cluster_interface.submit_next()
-                i += 1
+            if not signal_watcher.has_received_signal():
+                cluster_interface.submit_next_batch(num_jobs_to_submit_per_iteration)
 
             if cluster_interface.is_ready_to_check_for_failed_jobs():
                 cluster_interface.check_for_failed_jobs()
@@ -685,7 +842,9 @@ def grid_search(
                     " Ending procedure."
                 )
             check_for_keyboard_input()
-            time.sleep(constants.JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS)
+            wait_time = wait_for_job_state_change(
+                comm_server, wait_time, busy=cluster_interface.has_unsubmitted_jobs()
+            )
 
     print()  # empty line after progress bars
 
@@ -697,17 +856,16 @@ def grid_search(
     post_opt(cluster_interface)
 
     df, all_params, metrics = None, None, None
-    for job in jobs:
-        results = job.get_results()
-        if results is None:
-            continue
-        job_df, job_all_params, job_metrics = results
-        if df is None:
-            df, all_params, metrics = job_df, job_all_params, job_metrics
-        else:
-            df = pd.concat((df, job_df), axis=0)
+    # build the data frame from the plain per-job dictionaries in one go (much faster
+    # than concatenating the single-row data frames of all jobs)
+    jobs_with_results = [job for job in jobs if job.get_results() is not None]
+    if jobs_with_results:
+        _, all_params, metrics = jobs_with_results[0].get_results()
+        param_df = pd.DataFrame([job.flattened_params for job in jobs_with_results])
+        metric_df = pd.DataFrame([job.metrics for job in jobs_with_results])
+        df = pd.concat([param_df, metric_df], axis=1)
 
     if remove_working_dirs:
-        rm_dir_full(base_paths_and_files["current_result_dir"])
+        rm_dir_async(base_paths_and_files["current_result_dir"])
 
     return df, all_params, metrics, cluster_interface.collect_stats_from_hooks()
@@ -5,7 +5,7 @@ import os
 import pickle
 import random
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 import pandas as pd
 
@@ -19,6 +19,18 @@ if TYPE_CHECKING:
     from . import latex_utils
 
 
+def _pickle_to_file_atomically(obj: object, file: str) -> None:
+    """Pickle obj to file, such that file is never left in a partially written state.
+
+    The data is first written to a temporary file, which then replaces the target file.
+    """
+    tmp_file = f"{file}.tmp.{os.getpid()}"
+    with open(tmp_file, "wb") as f:
+        # protocol 5 allows to write the data of numpy arrays without copying it
+        pickle.dump(obj, f, protocol=5)
+    os.replace(tmp_file, file)
+
+
 class Optimizer(ABC):
     def __init__(
         self,
@@ -48,6 +60,15 @@ class Optimizer(ABC):
         """Return parameters for next job."""
         pass
 
+    def ask_many(self, num_samples: int) -> Iterable[dict]:
+        """Return parameters for the next ``num_samples`` jobs.
+
+        The default implementation calls :meth:`ask` each time the next parameters are
+        requested.  Overwrite this method for optimizers that can generate several
+        samples at once more efficiently.
+        """
+        return (self.ask() for _ in range(num_samples))
+
     @abstractmethod
     def tell(self, df, jobs):
         """Add results of finished jobs."""
@@ -177,20 +198,30 @@ class Metaoptimizer(Optimizer):
         else:
             return self.random_setting_to_restart
 
+    def ask_many(self, num_samples: int) -> list[dict]:
+        # sample from the distributions for all jobs at once
+        if num_samples <= 0:
+            return []
+        settings = list(self.distribution_list_sampler(num_samples=num_samples))
+        if self.with_restarts and len(self.minimal_df) >= self.num_jobs_in_elite:
+            settings = [
+                setting if random.random() < 0.8 else self.random_setting_to_restart
+                for setting in settings
+            ]
+        return settings
+
     def tell(self, jobs):
-        iteration_df = None
         if not isinstance(jobs, list):
             jobs = [jobs]
+        job_dfs = []
         for job in jobs:
             result = job.get_results()
             if result is not None:
                 df, _, _ = result
-            if iteration_df is not None:
-                iteration_df = pd.concat((iteration_df, df), axis=0, sort=True)
-            else:
-                iteration_df = df
-        if iteration_df is None:
+                job_dfs.append(df)
+        if not job_dfs:
             return
+        iteration_df = pd.concat(job_dfs, axis=0, sort=True)
         super().tell(iteration_df, jobs)
         current_best_params = self.get_best_params()
         for distr in self.optimized_params:
@@ -236,8 +267,7 @@ class Metaoptimizer(Optimizer):
         self.full_df.to_csv(os.path.join(directory, constants.FULL_DF_FILE))
         self.minimal_df.to_csv(os.path.join(directory, constants.REDUCED_DF_FILE))
         self_file = os.path.join(directory, constants.STATUS_PICKLE_FILE)
-        with open(self_file, "wb") as f:
-            pickle.dump(self, f)
+        _pickle_to_file_atomically(self, self_file)
 
 
 class NGOptimizer(Optimizer):
@@ -316,13 +346,19 @@ class NGOptimizer(Optimizer):
         del self.candidates[-1]
 
     def tell(self, jobs):
+        job_dfs = {}
         for job in jobs:
             results = job.get_results()
-            if results is not None:
-                df, params, metrics = results
-            else:
-                return
-            super().tell(df, jobs)
+            if results is None:
+                break
+            job_dfs[job] = results[0]
+        if not job_dfs:
+            return
+
+        # add the results of all jobs at once, instead of extending full_df job by job
+        super().tell(pd.concat(job_dfs.values(), axis=0, sort=True), jobs)
+
+        for job, df in job_dfs.items():
             if self.minimize:
                 self.optimizer.tell(
                     self.candidates[job.id], df.iloc[0][self.metric_to_optimize]
@@ -374,8 +410,7 @@ class NGOptimizer(Optimizer):
         self.full_df.to_csv(os.path.join(directory, constants.FULL_DF_FILE))
         self.minimal_df.to_csv(os.path.join(directory, constants.REDUCED_DF_FILE))
         self_file = os.path.join(directory, constants.STATUS_PICKLE_FILE)
-        with open(self_file, "wb") as f:
-            pickle.dump(self, f)
+        _pickle_to_file_atomically(self, self_file)
 
 
 class GridSearchOptimizer(Optimizer):
@@ -389,28 +424,34 @@ class GridSearchOptimizer(Optimizer):
             maybe_list_to_tuple(param.param_name): param.values
             for param in self.optimized_params
         }
-        self.set_setting_generator()
         self.restarts = restarts
+        self.set_setting_generator()
 
     def set_setting_generator(self):
-        self.setting_generator = get_sample_generator(
+        self.setting_generator = self._settings_with_restarts()
+
+    def _settings_with_restarts(self):
+        """Yield each setting ``restarts`` times in a row.
+
+        All restarts of one setting are yielded directly after each other (instead of
+        first yielding all settings for the first restart, then all for the second,
+        ...), so that jobs with identical settings are submitted together.  The current
+        restart is stored in :attr:`iteration`.
+        """
+        setting_generator = get_sample_generator(
             self.number_of_samples,
             self.parameter_dicts,
             distribution_list=None,
             extra_settings=None,
         )
+        for settings in setting_generator:
+            for restart in range(self.restarts):
+                self.iteration = restart
+                yield settings
+        self.iteration = self.restarts
 
     def ask(self):
-        settings = next(self.setting_generator, None)
-        if settings is None:
-            self.iteration += 1
-            if self.iteration == self.restarts:
-                return None
-            self.set_setting_generator()
-            settings = next(self.setting_generator)
-            assert settings is not None
-            return settings
-        return settings
+        return next(self.setting_generator, None)
 
     def ask_all(self):
         settings = self.ask()
@@ -11,9 +11,13 @@ import smart_settings
 
 from cluster_utils.base.settings import add_cmd_line_params, check_reserved_params
 
+from .git_utils import make_git_params
 from .optimizers import GridSearchOptimizer, Metaoptimizer, NGOptimizer
 from .utils import (
     check_import_in_fixed_params,
+    get_time_string,
+    home,
+    make_temporary_dir,
     rename_import_promise,
 )
 
@@ -205,6 +209,44 @@ def read_main_script_params_with_smart_settings(
     )
 
 
+def setup_run_paths(params) -> tuple[dict[str, str], Optional[dict[str, Any]]]:
+    """Set up the directories of a run and collect the paths needed by the job manager.
+
+    Creates the jobs directory and (unless ``run_in_working_dir`` is set) the project
+    directory to which the git repository is cloned.
+
+    Args:
+        params: Parameters as returned by :func:`read_main_script_params_from_args`.
+
+    Returns:
+        Tuple ``(base_paths_and_files, git_params)``.  ``git_params`` is None if the
+        jobs are run directly in the current working directory.
+    """
+    opt_procedure_name = params.optimization_procedure_name
+    result_dir = pathlib.Path(home, params.results_dir, opt_procedure_name)
+
+    time = get_time_string()
+    jobs_path = make_temporary_dir(f"{opt_procedure_name}-{time}-jobs")
+
+    git_params: Optional[dict[str, Any]]
+    if not params.get("run_in_working_dir", False):
+        main_path = make_temporary_dir(f"{opt_procedure_name}-{time}-project")
+        git_params = make_git_params(params.get("git_params"), main_path)
+    else:
+        main_path = os.getcwd()
+        git_params = None
+
+    base_paths_and_files = dict(
+        main_path=main_path,
+        script_to_run=params.script_relative_path,
+        result_dir=os.fspath(result_dir),
+        jobs_dir=jobs_path,
+        **params.environment_setup,
+    )
+
+    return base_paths_and_files, git_params
+
+
 optimizer_dict = {
     "cem_metaoptimizer": Metaoptimizer,
     "nevergrad": NGOptimizer,
@@ -44,6 +44,16 @@ fi
     "RETURN_CODE_FOR_RESUME": RETURN_CODE_FOR_RESUME
 }
 
+# Run script of a job array that executes the run scripts of several jobs (one per
+# array task).  The sbatch arguments in the run scripts of the individual jobs are
+# ignored in this case, so stdout/stderr are redirected to the job's files here.
+_SLURM_ARRAY_RUN_SCRIPT_TEMPLATE = """#!/bin/bash
+{sbatch_arg_lines}
+
+run_script="$(sed -n "$((SLURM_ARRAY_TASK_ID + 1))p" "{run_script_list_path}")"
+exec bash "${{run_script}}" >>"${{run_script%.sh}}.out" 2>>"${{run_script%.sh}}.err"
+"""
+
 
 # Possible job State values (according to `man sacct`)
 #
@@ -290,6 +300,10 @@ class SlurmClusterSubmission(ClusterSubmission):
     #: much)
     CHECK_FOR_FAILURES_INTERVAL_SEC = 60
 
+    #: Maximum number of jobs that are submitted in one job array.  Slurm rejects arrays
+    #: with indices >= MaxArraySize, which is 1001 by default.
+    MAX_ARRAY_SIZE = 1000
+
     def __init__(
         self,
         requirements: dict[str, Any],
@@ -300,8 +314,30 @@ class SlurmClusterSubmission(ClusterSubmission):
 
         self.requirements = SlurmJobRequirements.from_settings_dict(requirements)
 
-        #: Time stamp of the last time checking for errors
-        self._last_time_checking_for_failures = 0.0
+        #: Time stamp (of the monotonic clock) of the last time checking for errors
+        self._last_time_checking_for_failures = -float("inf")
+
+        #: Number of job arrays submitted so far (used for unique file names, as the
+        #: files of an array must not be overwritten while tasks are still pending)
+        self._n_submitted_arrays = 0
+
+    def _add_requirement_args(self, args: SBatchArgumentBuilder) -> None:
+        """Add the sbatch arguments corresponding to the job requirements."""
+        args.add("partition", self.requirements.partition)
+        args.add("cpus-per-task", self.requirements.cpus_per_task)
+        args.add("gpus-per-task", self.requirements.gpus_per_task)
+        args.add("mem", self.requirements.mem)
+        args.add("time", self.requirements.time)
+        args.add("nodes", self.requirements.nodes)
+        args.add("ntasks", self.requirements.ntasks)
+
+        if self.requirements.exclude:
+            args.add("exclude", ",".join(self.requirements.exclude))
+
+        if self.requirements.signal:
+            args.add("signal", self.requirements.signal)
+
+        args.extend_raw(self.requirements.extra_submission_options)
 
     def _generate_run_script(self, job: Job):
         """Generate a sbatch run script for the given job and return the path to it.
@@ -323,21 +359,7 @@ class SlurmClusterSubmission(ClusterSubmission):
         args.add("job-name", f"{job.opt_procedure_name}_{job.id}")
         args.add("output", stdout_file)
         args.add("error", stderr_file)
-        args.add("partition", self.requirements.partition)
-        args.add("cpus-per-task", self.requirements.cpus_per_task)
-        args.add("gpus-per-task", self.requirements.gpus_per_task)
-        args.add("mem", self.requirements.mem)
-        args.add("time", self.requirements.time)
-        args.add("nodes", self.requirements.nodes)
-        args.add("ntasks", self.requirements.ntasks)
-
-        if self.requirements.exclude:
-            args.add("exclude", ",".join(self.requirements.exclude))
-
-        if self.requirements.signal:
-            args.add("signal", self.requirements.signal)
-
-        args.extend_raw(self.requirements.extra_submission_options)
+        self._add_requirement_args(args)
 
         template_vars = {
             "id": job.id,
@@ -355,17 +377,75 @@ class SlurmClusterSubmission(ClusterSubmission):
         job.run_script_path = str(run_script_file_path)
 
     def submit_fn(self, job: Job) -> ClusterJobId:
-        logger = logging.getLogger("cluster_utils")
-
         # only generate run script for jobs that are submitted the first time
         if not job.waiting_for_resume:
             self._generate_run_script(job)
 
         assert job.run_script_path is not None
 
+        return self._sbatch(job.run_script_path, f"id {job.id}")
+
+    def submit_batch_fn(self, jobs: Sequence[Job]) -> list[ClusterJobId]:
+        cluster_ids = []
+        for i in range(0, len(jobs), self.MAX_ARRAY_SIZE):
+            cluster_ids.extend(self._submit_array(jobs[i : i + self.MAX_ARRAY_SIZE]))
+        return cluster_ids
+
+    def _submit_array(self, jobs: Sequence[Job]) -> list[ClusterJobId]:
+        # Submit all jobs with a single call of sbatch as a job array.  The array run
+        # script looks up the run script of its job in a list file, using the array
+        # task id as index.
+        for job in jobs:
+            if not job.waiting_for_resume:
+                self._generate_run_script(job)
+
+        submission_dir = pathlib.Path(self.submission_dir)
+        batch_name = f"batch{self._n_submitted_arrays}_{jobs[0].id}-{jobs[-1].id}"
+        self._n_submitted_arrays += 1
+        run_script_list_path = submission_dir / f"{batch_name}.txt"
+        run_script_list_path.write_text(
+            "".join(f"{job.run_script_path}\n" for job in jobs)
+        )
+
+        args = SBatchArgumentBuilder()
+        args.add("job-name", f"{jobs[0].opt_procedure_name}_{batch_name}")
+        args.add("array", f"0-{len(jobs) - 1}")
+        # output of the jobs is redirected by the array run script
+        args.add("output", "/dev/null")
+        args.add("error", "/dev/null")
+        self._add_requirement_args(args)
+
+        array_run_script_path = submission_dir / f"{batch_name}.sh"
+        array_run_script_path.write_text(
+            _SLURM_ARRAY_RUN_SCRIPT_TEMPLATE.format(
+                sbatch_arg_lines=args.construct_argument_comment_block(),
+                run_script_list_path=run_script_list_path,
+            )
+        )
+        array_run_script_path.chmod(0o755)  # Make executable
+
+        array_job_id = self._sbatch(
+            str(array_run_script_path), f"ids {jobs[0].id}-{jobs[-1].id}"
+        )
+
+        # tasks of a job array have ids of the form "{array_job_id}_{task_id}"
+        return [ClusterJobId(f"{array_job_id}_{i}") for i in range(len(jobs))]
+
+    def _sbatch(self, run_script_path: str, jobs_str: str) -> ClusterJobId:
+        """Submit the given run script with sbatch.
+
+        Args:
+            run_script_path: The run script that is passed to sbatch.
+            jobs_str: Description of the submitted jobs for log messages.
+
+        Returns:
+            The cluster job id reported by sbatch.
+        """
+        logger = logging.getLogger("cluster_utils")
+
         # use open-mode=append so that output of jobs that are restarted (via
         # exit_for_resume) does not overwrite the output of previous runs
-        sbatch_cmd = ["sbatch", "--open-mode=append", job.run_script_path]
+        sbatch_cmd = ["sbatch", "--open-mode=append", run_script_path]
         logger.debug("Execute command %s", sbatch_cmd)
 
         # TODO This timeout/retry-loop is copied from the Condor implementation.  Does
@@ -382,11 +462,11 @@ class SlurmClusterSubmission(ClusterSubmission):
                 sbatch_stdout = result.stdout.decode("utf-8")
                 break
             except subprocess.TimeoutExpired:
-                logger.warning("Job submission for id %d hangs. Retrying...", job.id)
+                logger.warning("Job submission for %s hangs. Retrying...", jobs_str)
             except subprocess.CalledProcessError as e:
                 logger.warning(
-                    "Job submission for id %d failed with exit code %d. Retrying...",
-                    job.id,
+                    "Job submission for %s failed with exit code %d. Retrying...",
+                    jobs_str,
                     e.returncode,
                 )
         else:  # executed if loop finishes without break
@@ -401,7 +481,7 @@ class SlurmClusterSubmission(ClusterSubmission):
 
         if not sbatch_stdout:
             msg = (
-                f"[Job #{job.id}] sbatch returned without error but did not print a"
+                f"[Job {jobs_str}] sbatch returned without error but did not print a"
                 " cluster job id."
             )
             logger.fatal(msg)
@@ -429,10 +509,10 @@ class SlurmClusterSubmission(ClusterSubmission):
         logger.info("Cancel job with cluster id %s", cluster_id)
 
         cmd = ["scancel", cluster_id]
-        run(cmd, stderr=PIPE, stdout=PIPE)
+        run(cmd, stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
 
     def is_ready_to_check_for_failed_jobs(self) -> bool:
-        time_since_last_check = time.time() - self._last_time_checking_for_failures
+        time_since_last_check = time.monotonic() - self._last_time_checking_for_failures
         return time_since_last_check >= self.CHECK_FOR_FAILURES_INTERVAL_SEC
 
     def mark_failed_jobs(self, jobs: Sequence[Job]) -> None:
@@ -483,4 +563,4 @@ class SlurmClusterSubmission(ClusterSubmission):
 
                 job.mark_failed(error_msg)
 
-        self._last_time_checking_for_failures = time.time()
+        self._last_time_checking_for_failures = time.monotonic()
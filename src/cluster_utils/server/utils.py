@@ -3,6 +3,7 @@ from __future__ import annotations
 import collections
 import datetime
 import enum
+import fcntl
 import itertools
 import json
 import logging
@@ -13,10 +14,12 @@ import random
 import re
 import shutil
 import signal
+import subprocess
+import uuid
 from collections import defaultdict
 from pathlib import Path
 from time import sleep
-from typing import Any
+from typing import Any, Iterable
 
 import colorama
 
@@ -119,9 +122,12 @@ def check_valid_param_name(string):
 
 def rm_dir_full(dir_name):
     logger = logging.getLogger("cluster_utils")
-    sleep(0.5)
-    if os.path.exists(dir_name):
-        shutil.rmtree(dir_name, ignore_errors=True)
+    # nothing to do (and especially no need to wait) if the directory does not exist
+    # (e.g. as it was already removed before)
+    if not os.path.exists(dir_name):
+        return
+
+    shutil.rmtree(dir_name, ignore_errors=True)
 
     # filesystem is sometimes slow to response
     if os.path.exists(dir_name):
@@ -132,6 +138,84 @@ def rm_dir_full(dir_name):
         logger.warning(f"Removing of dir {dir_name} failed")
 
 
+#: ioctl request code to clone a file on copy-on-write file systems (FICLONE from
+#: linux/fs.h; it is only provided by the fcntl module since Python 3.12)
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+
+def copy_file_reflink(src: str, dst: str, *, follow_symlinks: bool = True) -> str:
+    """Copy a file, sharing the data with the source file if possible.
+
+    On copy-on-write file systems (e.g. btrfs or XFS) the copy is created as a reflink,
+    i.e. the data blocks are only copied once either of the files is modified, which
+    makes copying large files almost free.  Otherwise (or if source and destination are
+    on different file systems), this falls back to :func:`shutil.copy2`.
+
+    Can be used as ``copy_function`` for :func:`shutil.copytree`.
+    """
+    try:
+        with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+            fcntl.ioctl(f_dst.fileno(), _FICLONE, f_src.fileno())
+    except OSError:
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+    shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+    return dst
+
+
+#: Background ``rm -rf`` processes started by :func:`rm_dirs_async` that may still be
+#: running (finished ones are reaped on the next call).
+_rm_processes: list[subprocess.Popen] = []
+
+
+def rm_dirs_async(dir_names: Iterable[str | os.PathLike]) -> None:
+    """Remove directories in the background.
+
+    The directories are first renamed, so that they disappear immediately (and the
+    paths can be reused), and are then deleted by a single separate ``rm -rf`` process.
+    This process does not block the caller and keeps running if cluster_utils exits in
+    the meantime.
+
+    Directories that cannot be renamed are removed synchronously with
+    :func:`rm_dir_full`.
+    """
+    logger = logging.getLogger("cluster_utils")
+
+    # reap the processes of previous calls that are finished
+    _rm_processes[:] = [proc for proc in _rm_processes if proc.poll() is None]
+
+    trash_dirs = []
+    for dir_name in dir_names:
+        if not os.path.exists(dir_name):
+            continue
+
+        trash_dir = f"{os.fspath(dir_name).rstrip(os.sep)}.trash.{uuid.uuid4().hex}"
+        try:
+            os.rename(dir_name, trash_dir)
+        except OSError as e:
+            logger.debug("Failed to rename %s (%s).  Remove it directly.", dir_name, e)
+            rm_dir_full(dir_name)
+        else:
+            trash_dirs.append(trash_dir)
+
+    if not trash_dirs:
+        return
+
+    proc = subprocess.Popen(
+        ["rm", "-rf", "--", *trash_dirs],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # do not get killed together with cluster_utils (e.g. by Ctrl+C)
+        start_new_session=True,
+    )
+    _rm_processes.append(proc)
+
+
+def rm_dir_async(dir_name: str | os.PathLike) -> None:
+    """Remove a directory in the background.  See :func:`rm_dirs_async`."""
+    rm_dirs_async([dir_name])
+
+
 def get_sample_generator(
     samples, hyperparam_dict, distribution_list, extra_settings=None
 ):
@@ -296,17 +380,23 @@ def make_temporary_dir(name: str) -> str:
     """Make temporary directory with specified name.
 
     Directory name is made unique by appending an id if the directory already exists.
+    This is safe also if several processes create directories with the same name at the
+    same time.
     """
     base_dir = get_cache_directory()
     run_dir = os.path.join(base_dir, name)
 
     count = 2
-    while os.path.isdir(run_dir):
-        run_dir = os.path.join(base_dir, f"{name}-{count}")
-        count += 1
-
-    os.mkdir(run_dir, mode=0o700)
-    return run_dir
+    while True:
+        # directly try to create the directory instead of checking for existence first,
+        # to avoid a race with other processes creating the same directory
+        try:
+            os.mkdir(run_dir, mode=0o700)
+        except FileExistsError:
+            run_dir = os.path.join(base_dir, f"{name}-{count}")
+            count += 1
+        else:
+            return run_dir
 
 
 def dict_to_dirname(setting, job_id, smart_naming=True):
@@ -321,6 +411,19 @@ def dict_to_dirname(setting, job_id, smart_naming=True):
     return str(job_id)
 
 
+def clone_nested_settings(settings):
+    """Copy the dicts and lists of a nested settings structure.
+
+    Cheaper alternative to :func:`copy.deepcopy` for settings, which only consist of
+    nested dicts/lists with immutable leaves.  Leaf values are not copied.
+    """
+    if isinstance(settings, dict):
+        return {key: clone_nested_settings(value) for key, value in settings.items()}
+    if isinstance(settings, list):
+        return [clone_nested_settings(value) for value in settings]
+    return settings
+
+
 def update_recursive(d, u, defensive=False):
     for k, v in u.items():
         if defensive and k not in d:
@@ -415,7 +518,7 @@ def save_report_data(results_dir: str | os.PathLike, **kwargs: Any) -> None:
     filename = results_dir / constants.REPORT_DATA_FILE
     logger.info("Save report data to %s", filename)
     with open(filename, "wb") as f:
-        pickle.dump(kwargs, f)
+        pickle.dump(kwargs, f, protocol=5)
 
 
 def styled(text: str, *args) -> str:
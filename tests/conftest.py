@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from cluster_utils.server.job import Job
+
+
+@pytest.fixture()
+def make_job():
+    """Factory for creating :class:`Job` instances with dummy values for the tests."""
+
+    def _make_job(
+        job_id: int = 13,
+        *,
+        settings: dict | None = None,
+        other_params: dict | None = None,
+        paths: dict | None = None,
+        iteration: int = 0,
+    ) -> Job:
+        return Job(
+            id=job_id,
+            settings={} if settings is None else settings,
+            other_params={} if other_params is None else other_params,
+            paths={} if paths is None else paths,
+            iteration=iteration,
+            connection_info={"ip": "127.0.0.1", "port": 12345},
+            opt_procedure_name="unittest",
+            singularity_settings=None,
+        )
+
+    return _make_job
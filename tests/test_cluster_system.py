@@ -1,4 +1,5 @@
 import cluster_utils.server.cluster_system as cs
+from cluster_utils.server.job import JobStatus
 
 
 def test_is_command_available():
@@ -6,3 +7,58 @@ def test_is_command_available():
     assert cs.is_command_available("ls")
 
     assert not cs.is_command_available("obscure_command_that_does_not_exist")
+
+
+class FakeClusterSubmission(cs.ClusterSubmission):
+    def submit_fn(self, job):
+        return cs.ClusterJobId(f"fake-{job.id}")
+
+    def stop_fn(self, cluster_id):
+        pass
+
+    def is_ready_to_check_for_failed_jobs(self):
+        return True
+
+    def mark_failed_jobs(self, jobs):
+        pass
+
+
+def test_job_status_counts(tmp_path, make_job):
+    cluster = FakeClusterSubmission({"jobs_dir": str(tmp_path)})
+    jobs = [make_job(i) for i in range(4)]
+    cluster.add_jobs(jobs)
+
+    assert cluster.get_job(2) is jobs[2]
+    assert cluster.get_job(42) is None
+    assert cluster.n_idle_jobs == 4
+    assert cluster.n_submitted_jobs == 0
+
+    while cluster.has_unsubmitted_jobs():
+        cluster.submit_next()
+    assert cluster.n_submitted_jobs == 4
+    assert cluster.n_idle_jobs == 4
+
+    jobs[0].status = JobStatus.RUNNING
+    jobs[1].status = JobStatus.RUNNING
+    jobs[2].mark_failed("error")
+    assert cluster.running_jobs == [jobs[0], jobs[1]]
+    assert cluster.n_idle_jobs == 1
+
+    jobs[1].metrics = {"result": 1.0}
+    jobs[1].final_settings = {}
+    jobs[1].set_results()
+    jobs[1].status = JobStatus.CONCLUDED
+
+    assert cluster.n_running_jobs == 1
+    assert cluster.successful_jobs == [jobs[1]]
+    assert cluster.failed_jobs == [jobs[2]]
+    assert cluster.n_completed_jobs == 2
+    assert cluster.pop_new_successful_jobs() == [jobs[1]]
+    assert cluster.pop_new_successful_jobs() == []
+
+    # resubmitting a job (e.g. for resume) does not count as a new submission
+    jobs[0].waiting_for_resume = True
+    cluster.resume(jobs[0])
+    cluster.submit_next()
+    assert cluster.n_submitted_jobs == 4
+    assert cluster.n_running_jobs == 0
@@ -0,0 +1,132 @@
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+
+import cluster_utils.server.condor_cluster_system as condor_sub_module
+from cluster_utils.server.condor_cluster_system import (
+    CONDOR_LOG_TAIL_SIZE,
+    CondorClusterSubmission,
+)
+from cluster_utils.server.job import JobStatus
+
+
+@pytest.fixture()
+def job_data(tmp_path: pathlib.Path, make_job) -> SimpleNamespace:
+    jobs_dir = tmp_path / "jobs_dir"
+    jobs_dir.mkdir()
+    paths = {
+        "main_path": str(tmp_path / "main_path"),
+        "script_to_run": "foobar.py",
+        "jobs_dir": str(jobs_dir),
+        "current_result_dir": str(tmp_path / "current_result_dir"),
+    }
+    requirements = {
+        "request_cpus": 2,
+        "request_gpus": 0,
+        "memory_in_mb": 1000,
+        "bid": 800,
+        "cuda_requirement": None,
+        "extra_submission_options": ["foo=bar"],
+    }
+    job = make_job(13, paths=paths, iteration=2)
+
+    return SimpleNamespace(
+        requirements=requirements,
+        paths=paths,
+        jobs_dir=jobs_dir,
+        job=job,
+    )
+
+
+def test_generate_job_spec_file(job_data):
+    condor_sub = CondorClusterSubmission(job_data.requirements, job_data.paths)
+    condor_sub.generate_job_spec_file(job_data.job)
+
+    expected_run_script = job_data.jobs_dir / "job_2_13.sh"
+    expected_spec_file = job_data.jobs_dir / "job_2_13.sh.sub"
+    assert job_data.job.run_script_path == str(expected_run_script)
+    assert job_data.job.job_spec_file_path == str(expected_spec_file)
+
+    run_script = expected_run_script.read_text()
+    assert run_script.startswith("#!/bin/bash\n# Submission ID 13\n")
+    assert job_data.job.generate_execution_cmd(job_data.paths) in run_script
+    assert f"rm -f {expected_spec_file}" in run_script
+
+    spec = expected_spec_file.read_text()
+    assert "JobBatchName=unittest\n" in spec
+    assert f"executable = {expected_run_script}\n" in spec
+    assert "request_cpus=2\nrequest_gpus=0\nrequest_memory=1000\n" in spec
+    assert "# Extra options\nfoo=bar\n" in spec
+
+
+@pytest.mark.parametrize(
+    ("return_value", "expected_status"),
+    [(0, JobStatus.SUBMITTED), (1, JobStatus.FAILED)],
+)
+def test_mark_failed_jobs(job_data, return_value, expected_status):
+    condor_sub = CondorClusterSubmission(job_data.requirements, job_data.paths)
+    job = job_data.job
+    job.run_script_path = str(job_data.jobs_dir / "job_2_13.sh")
+    job.status = JobStatus.SUBMITTED
+
+    # the host is reported far before the end of the log, i.e. outside of the part
+    # that is read for checking the return value
+    log = (
+        "001 (42.000.000) Job executing on host: <172.22.2.15:9618?addrs=...>\n"
+        + "...\n" * CONDOR_LOG_TAIL_SIZE
+        + "005 (42.000.000) Job terminated.\n"
+        + f"\t(1) Normal termination (return value {return_value})\n"
+    )
+    pathlib.Path(f"{job.run_script_path}.log").write_text(log)
+    pathlib.Path(f"{job.run_script_path}.err").write_text("some error")
+
+    condor_sub.mark_failed_jobs([job])
+
+    assert job.status == expected_status
+    if expected_status == JobStatus.FAILED:
+        assert job.error_info == "some error"
+        assert job.hostname == "?015"
+
+
+def test_check_for_failed_jobs_is_throttled(job_data):
+    condor_sub = CondorClusterSubmission(job_data.requirements, job_data.paths)
+    assert condor_sub.is_ready_to_check_for_failed_jobs()
+
+    condor_sub.mark_failed_jobs([])
+    assert not condor_sub.is_ready_to_check_for_failed_jobs()
+
+    condor_sub._last_time_checking_for_failures -= (
+        condor_sub.CHECK_FOR_FAILURES_INTERVAL_SEC
+    )
+    assert condor_sub.is_ready_to_check_for_failed_jobs()
+
+
+def test_submit_batch(job_data, make_job, monkeypatch):
+    condor_sub = CondorClusterSubmission(job_data.requirements, job_data.paths)
+    jobs = [make_job(i, paths=job_data.paths) for i in range(3)]
+    condor_sub.add_jobs(jobs)
+
+    submit_calls = []
+
+    def fake_run(cmd, **kwargs):
+        # submit description has to contain all jobs
+        spec_file = cmd[0].split()[-1]
+        submit_calls.append(pathlib.Path(spec_file).read_text())
+        stdout = b"Submitting job(s)...\n3 job(s) submitted to cluster 42.\n"
+        return SimpleNamespace(stdout=stdout)
+
+    monkeypatch.setattr(condor_sub_module, "run", fake_run)
+
+    condor_sub.submit_next_batch(5)
+
+    assert len(submit_calls) == 1
+    assert submit_calls[0].count("\nqueue\n") == 3
+    for job in jobs:
+        assert f"executable = {job.run_script_path}\n" in submit_calls[0]
+    assert [job.cluster_id for job in jobs] == ["42.0", "42.1", "42.2"]
+    assert all(job.status == JobStatus.SUBMITTED for job in jobs)
+    assert condor_sub.n_submitted_jobs == 3
+    assert not condor_sub.has_unsubmitted_jobs()
+    # the combined submit description is removed again
+    assert not list(job_data.jobs_dir.glob("batch_*"))
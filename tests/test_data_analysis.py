@@ -76,3 +76,19 @@ def test_average_out(dataframe):
 
     pd.testing.assert_frame_equal(result_asc, expected_asc)
     pd.testing.assert_frame_equal(result_des, expected_asc.iloc[::-1])
+
+
+def test_best_jobs(dataframe):
+    best = data_analysis.best_jobs(dataframe, "result", how_many=2)
+    assert list(best["id"]) == [2, 3]
+
+    best = data_analysis.best_jobs(dataframe, "result", how_many=2, minimum=True)
+    assert list(best["id"]) == [1, 3]
+
+    best = data_analysis.best_jobs(dataframe, "result", how_many=5)
+    assert list(best["id"]) == [2, 3, 1]
+
+    # jobs with NaN as result are ranked last
+    dataframe.loc[1, "result"] = float("nan")
+    best = data_analysis.best_jobs(dataframe, "result", how_many=3, minimum=True)
+    assert list(best["id"]) == [1, 3, 2]
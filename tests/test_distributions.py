@@ -0,0 +1,14 @@
+from cluster_utils.server.distributions import Discrete
+
+
+def test_discrete_prepare_samples():
+    distribution = Discrete(param="x", options=[1, 2, 3])
+
+    # more samples than the minimum number of prepared samples
+    distribution.prepare_samples(15)
+    samples = [distribution.sample() for _ in range(15)]
+    assert all(sample in (1, 2, 3) for sample in samples)
+
+    # at least ten samples are prepared, even if fewer are requested
+    distribution.prepare_samples(3)
+    assert len(distribution.samples) == 10
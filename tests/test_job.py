@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from cluster_utils.base import constants
+from cluster_utils.server.job import JobStatus
+
+
+@pytest.fixture()
+def paths(tmp_path):
+    return {
+        "main_path": str(tmp_path / "main_path"),
+        "script_to_run": "foobar.py",
+        "current_result_dir": str(tmp_path / "current_result_dir"),
+    }
+
+
+@pytest.fixture()
+def job(make_job, paths):
+    return make_job(
+        13,
+        settings={"x": 1, "nested": {"y": 2}},
+        other_params={"nested": {"z": 3}},
+        paths=paths,
+    )
+
+
+def test_generate_execution_cmd(tmp_path, job, paths):
+
+    cmd = job.generate_execution_cmd(paths)
+
+    assert cmd.startswith(f"cd {paths['main_path']}\n")
+    assert f"python3 {tmp_path / 'main_path' / 'foobar.py'} --job-id=13" in cmd
+    assert job.final_settings["nested"] == {"y": 2, "z": 3}
+    # settings of the job must not be modified
+    assert job.settings == {"x": 1, "nested": {"y": 2}}
+
+
+def test_get_results(job, paths):
+    assert job.get_results() is None
+
+    job.final_settings = job.generate_final_setting(paths)
+    job.metrics = {"result": 0.5, "another_metric": 1}
+    job.set_results()
+
+    df, params, metrics = job.get_results()
+    assert params == ("_id", "id", "nested.y", "nested.z", "working_dir", "x")
+    assert metrics == ("another_metric", "result")
+    assert df["result"].iloc[0] == 0.5
+    assert df["nested.z"].iloc[0] == 3
+
+
+def test_try_load_results_from_filesystem(tmp_path, job, paths):
+    working_dir = tmp_path / "current_result_dir" / "13"
+    working_dir.mkdir(parents=True)
+    (working_dir / constants.CLUSTER_METRIC_FILE).write_text("result\n0.5\n")
+    (working_dir / constants.CLUSTER_PARAM_FILE).write_text(
+        "x,nested.y,nested.z,id\n1,2,3,13\n"
+    )
+
+    job.try_load_results_from_filesystem(paths)
+    assert job.status == JobStatus.CONCLUDED
+    assert job.metrics == {"result": 0.5}
+
+
+def test_try_load_results_from_filesystem_different_settings(tmp_path, job, paths):
+    working_dir = tmp_path / "current_result_dir" / "13"
+    working_dir.mkdir(parents=True)
+    (working_dir / constants.CLUSTER_METRIC_FILE).write_text("result\n0.5\n")
+    # results were produced with a different value of x
+    (working_dir / constants.CLUSTER_PARAM_FILE).write_text(
+        "x,nested.y,nested.z,id\n5,2,3,13\n"
+    )
+
+    job.try_load_results_from_filesystem(paths)
+    assert job.status == JobStatus.INITIAL_STATUS
+    assert job.get_results() is None
+
+
+@pytest.mark.parametrize(
+    ("settings", "stored_params"),
+    [
+        ({"lr": 0.1 + 0.2}, "lr\n0.30000000000000004\n"),
+        ({"lr": np.float64(1e-3)}, "lr\n0.001\n"),
+        ({"lr": 3e-4}, "lr\n0.00030000000000000003\n"),
+        ({"layers": (64, 32)}, 'layers\n"[64, 32]"\n'),
+        ({"layers": [64, 32]}, 'layers\n"(64, 32)"\n'),
+        ({"layers": (np.float64(0.5),)}, 'layers\n"[np.float64(0.5)]"\n'),
+        ({"name": "1e-3"}, "name\n1e-3\n"),
+    ],
+)
+def test_try_load_results_from_filesystem_parsed_values(
+    tmp_path, make_job, paths, settings, stored_params
+):
+    job = make_job(13, settings=settings, paths=paths)
+    working_dir = tmp_path / "current_result_dir" / "13"
+    working_dir.mkdir(parents=True)
+    (working_dir / constants.CLUSTER_METRIC_FILE).write_text("result\n0.5\n")
+    (working_dir / constants.CLUSTER_PARAM_FILE).write_text(stored_params)
+
+    job.try_load_results_from_filesystem(paths)
+    assert job.status == JobStatus.CONCLUDED
+
+
+def test_try_load_results_from_filesystem_different_list(tmp_path, make_job, paths):
+    job = make_job(13, settings={"layers": [64, 32]}, paths=paths)
+    working_dir = tmp_path / "current_result_dir" / "13"
+    working_dir.mkdir(parents=True)
+    (working_dir / constants.CLUSTER_METRIC_FILE).write_text("result\n0.5\n")
+    (working_dir / constants.CLUSTER_PARAM_FILE).write_text('layers\n"[64, 16]"\n')
+
+    job.try_load_results_from_filesystem(paths)
+    assert job.status == JobStatus.INITIAL_STATUS
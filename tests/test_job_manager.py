@@ -0,0 +1,170 @@
+import concurrent.futures
+import errno
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from cluster_utils.base import constants
+from cluster_utils.server.job import JobStatus
+from cluster_utils.server.job_manager import (
+    cancel_pending_reports,
+    kill_bad_looking_jobs,
+    run_pending_cleanups,
+    update_best_job_datadirs,
+    wait_for_job_state_change,
+)
+
+
+def set_reported_metrics(job, reported_metric_values, final_metric=None):
+    job.final_settings = {}
+    job.cluster_id = f"cluster-{job.id}"
+    job.reported_metric_values = reported_metric_values
+    if final_metric is not None:
+        job.metrics = {"result": final_metric}
+        job.status = JobStatus.CONCLUDED
+        job.set_results()
+    else:
+        job.status = JobStatus.RUNNING
+    return job
+
+
+def test_update_best_job_datadirs(tmp_path):
+    result_dir = tmp_path / "results"
+    working_dirs_root = result_dir / "working_directories"
+    working_dirs = []
+    for job_id in range(4):
+        working_dir = working_dirs_root / str(job_id)
+        (working_dir / "sub").mkdir(parents=True)
+        (working_dir / "sub" / "data.txt").write_text(f"job {job_id}")
+        working_dirs.append(str(working_dir))
+
+    best_jobs_dir = result_dir / "best_jobs"
+
+    update_best_job_datadirs(result_dir, working_dirs[:2], remove_working_dirs=False)
+    assert sorted(p.name for p in best_jobs_dir.iterdir()) == [
+        "directories_0",
+        "directories_1",
+    ]
+    assert (best_jobs_dir / "directories_1" / "sub" / "data.txt").read_text() == "job 1"
+
+    # outdated directories are removed, working directories are removed if requested
+    update_best_job_datadirs(result_dir, working_dirs[1:3], remove_working_dirs=True)
+    assert sorted(p.name for p in best_jobs_dir.iterdir()) == [
+        "directories_1",
+        "directories_2",
+    ]
+    assert (best_jobs_dir / "directories_2" / "sub" / "data.txt").read_text() == "job 2"
+    assert sorted(p.name for p in working_dirs_root.iterdir()) == ["0", "3"]
+
+
+def test_kill_bad_looking_jobs(make_job):
+    # finished jobs with intermediate values that are consistent with the final ranks
+    finished_jobs = [
+        set_reported_metrics(
+            make_job(i), [10.0 + i, 5.0 + i, 2.0 + i], final_metric=1.0 + i
+        )
+        for i in range(6)
+    ]
+    good_job = set_reported_metrics(make_job(10), [9.5])
+    bad_job = set_reported_metrics(make_job(11), [100.0])
+    # jobs that ran more than half of their runtime are not killed
+    late_job = set_reported_metrics(make_job(12), [100.0, 100.0, 100.0])
+    stopped = []
+    cluster_interface = SimpleNamespace(
+        successful_jobs=finished_jobs,
+        running_jobs=[good_job, bad_job, late_job],
+        stop_fn=stopped.append,
+    )
+
+    kill_bad_looking_jobs(
+        cluster_interface,
+        "result",
+        minimize=True,
+        target_rank=2,
+        how_many_stds=1.0,
+    )
+
+    assert stopped == ["cluster-11"]
+    assert bad_job.status == JobStatus.CONCLUDED
+    assert bad_job.metrics == {"result": 100.0}
+    assert good_job.status == JobStatus.RUNNING
+    assert late_job.status == JobStatus.RUNNING
+
+
+def test_update_best_job_datadirs_move_across_file_systems(tmp_path, monkeypatch):
+    result_dir = tmp_path / "results"
+    working_dir = result_dir / "working_directories" / "0"
+    working_dir.mkdir(parents=True)
+    (working_dir / "data.txt").write_text("job 0")
+
+    # simulate that working directory and results are on different file systems
+    def rename_across_devices(src, dst):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), src, dst)
+
+    monkeypatch.setattr(os, "rename", rename_across_devices)
+
+    update_best_job_datadirs(result_dir, [str(working_dir)], remove_working_dirs=True)
+
+    best_job_dir = result_dir / "best_jobs" / "directories_0"
+    assert (best_job_dir / "data.txt").read_text() == "job 0"
+    assert not working_dir.exists()
+
+
+def test_wait_for_job_state_change(monkeypatch):
+    monkeypatch.setattr(constants, "JOB_MANAGER_MAX_IDLE_WAIT_TIME_IN_SECS", 0.05)
+    comm_server = SimpleNamespace(job_state_changed=threading.Event())
+    loop_time = constants.JOB_MANAGER_LOOP_SLEEP_TIME_IN_SECS
+    max_time = 10.0
+
+    # nothing happens -> wait time is increased up to the maximum
+    assert wait_for_job_state_change(comm_server, 0.01, busy=False) == 0.02
+    assert wait_for_job_state_change(comm_server, 0.04, busy=False) == 0.05
+
+    # still work to do -> back to normal loop time
+    assert wait_for_job_state_change(comm_server, 0.01, busy=True) == loop_time
+
+    # state change -> return immediately and reset wait time
+    comm_server.job_state_changed.set()
+    start = time.monotonic()
+    assert wait_for_job_state_change(comm_server, max_time, busy=False) == loop_time
+    assert time.monotonic() - start < max_time
+    assert not comm_server.job_state_changed.is_set()
+
+
+def test_run_pending_cleanups(caplog):
+    calls = []
+    failed_report = concurrent.futures.Future()
+    failed_report.set_exception(RuntimeError("no report"))
+    successful_report = concurrent.futures.Future()
+    successful_report.set_result(None)
+    pending_cleanups = [
+        (failed_report, lambda: calls.append(threading.current_thread())),
+        (successful_report, lambda: calls.append(threading.current_thread())),
+    ]
+
+    run_pending_cleanups(pending_cleanups)
+
+    # clean-ups run in the calling thread, also if the report failed
+    assert calls == [threading.current_thread()] * 2
+    assert pending_cleanups == []
+    assert "Failed to generate PDF report" in caplog.text
+
+
+def test_run_pending_cleanups_error():
+    report = concurrent.futures.Future()
+    report.set_result(None)
+
+    def failing_clean_up():
+        raise OSError("cannot move")
+
+    with pytest.raises(OSError, match="cannot move"):
+        run_pending_cleanups([(report, failing_clean_up)])
+
+
+def test_cancel_pending_reports():
+    report = concurrent.futures.Future()
+    cancel_pending_reports([(report, lambda: None)])
+    assert report.cancelled()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pickle
+
+from cluster_utils.base import constants
+from cluster_utils.server.distributions import Discrete
+from cluster_utils.server.optimizers import GridSearchOptimizer, Metaoptimizer
+
+
+class DummyDistribution:
+    def __init__(self, param, values):
+        self.param_name = param
+        self.values = values
+
+
+def test_grid_search_optimizer_groups_restarts():
+    optimizer = GridSearchOptimizer(
+        metric_to_optimize="result",
+        minimize=True,
+        report_hooks=[],
+        number_of_samples=None,
+        optimized_params=[DummyDistribution("x", [1, 2])],
+        restarts=3,
+    )
+
+    settings_and_iterations = []
+    for settings in optimizer.ask_all():
+        settings_and_iterations.append((settings["x"], optimizer.iteration))
+
+    assert settings_and_iterations == [
+        (1, 0),
+        (1, 1),
+        (1, 2),
+        (2, 0),
+        (2, 1),
+        (2, 2),
+    ]
+    assert optimizer.ask() is None
+
+
+def test_save_data_and_self(tmp_path):
+    optimizer = Metaoptimizer(
+        metric_to_optimize="result",
+        minimize=True,
+        report_hooks=[],
+        number_of_samples=10,
+        optimized_params=[Discrete(param="x", options=[1, 2])],
+        num_jobs_in_elite=5,
+        with_restarts=False,
+    )
+    # leftover from an earlier run must simply be replaced
+    (tmp_path / constants.STATUS_PICKLE_FILE).write_text("old")
+
+    optimizer.save_data_and_self(tmp_path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [
+            constants.FULL_DF_FILE,
+            constants.REDUCED_DF_FILE,
+            constants.STATUS_PICKLE_FILE,
+        ]
+    )
+    with open(tmp_path / constants.STATUS_PICKLE_FILE, "rb") as f:
+        loaded = pickle.load(f)
+    assert loaded.num_jobs_in_elite == 5
+
+
+def test_metaoptimizer_ask_many():
+    optimizer = Metaoptimizer(
+        metric_to_optimize="result",
+        minimize=True,
+        report_hooks=[],
+        number_of_samples=20,
+        optimized_params=[Discrete(param="x", options=[1, 2])],
+        num_jobs_in_elite=5,
+        with_restarts=False,
+    )
+
+    settings = optimizer.ask_many(15)
+    assert len(settings) == 15
+    assert all(setting["x"] in (1, 2) for setting in settings)
+
+    assert optimizer.ask_many(0) == []
@@ -3,7 +3,7 @@ from types import SimpleNamespace
 
 import pytest
 
-from cluster_utils.server.job import Job
+import cluster_utils.server.slurm_cluster_system as slurm_sub_module
 from cluster_utils.server.slurm_cluster_system import (
     SBatchArgumentBuilder,
     SlurmClusterSubmission,
@@ -13,7 +13,7 @@ from cluster_utils.server.slurm_cluster_system import (
 
 
 @pytest.fixture()
-def job_data(tmp_path: pathlib.Path) -> SimpleNamespace:
+def job_data(tmp_path: pathlib.Path, make_job) -> SimpleNamespace:
     base_requirements = {
         "partition": "part-foo",
         "request_cpus": 10,
@@ -31,16 +31,7 @@ def job_data(tmp_path: pathlib.Path) -> SimpleNamespace:
         "current_result_dir": str(tmp_path / "current_result_dir"),
     }
 
-    job = Job(
-        id=13,
-        settings={},
-        other_params={},
-        paths=paths,
-        iteration=2,
-        connection_info={"ip": "127.0.0.1", "port": 12345},
-        opt_procedure_name="unittest",
-        singularity_settings=None,
-    )
+    job = make_job(13, paths=paths, iteration=2)
 
     return SimpleNamespace(
         requirements=base_requirements,
@@ -226,3 +217,57 @@ def test_extract_job_status_from_sacct_output__including_intermediate_steps():
         match="Unexpected line in sacct output: 4597753.batch|cpu-short|FAILED|1:0",
     ):
         extract_job_status_from_sacct_output(sacct_output)
+
+
+def test_submit_batch(job_data, make_job, monkeypatch):
+    slurm_sub = SlurmClusterSubmission(job_data.requirements, job_data.paths)
+    jobs = [make_job(i, paths=job_data.paths) for i in range(3)]
+    slurm_sub.add_jobs(jobs)
+
+    sbatch_calls = []
+
+    def fake_run(cmd, **kwargs):
+        sbatch_calls.append(cmd)
+        return SimpleNamespace(stdout=b"Submitted batch job 42\n")
+
+    monkeypatch.setattr(slurm_sub_module, "run", fake_run)
+
+    slurm_sub.submit_next_batch(5)
+
+    assert len(sbatch_calls) == 1
+    array_run_script = pathlib.Path(sbatch_calls[0][-1]).read_text()
+    assert "#SBATCH --array=0-2\n" in array_run_script
+    assert "#SBATCH --partition=part-foo\n" in array_run_script
+    run_script_list = (job_data.jobs_dir / "batch0_0-2.txt").read_text()
+    assert run_script_list.splitlines() == [job.run_script_path for job in jobs]
+    assert [job.cluster_id for job in jobs] == ["42_0", "42_1", "42_2"]
+    assert slurm_sub.n_submitted_jobs == 3
+    assert not slurm_sub.has_unsubmitted_jobs()
+
+    # resubmitting the same jobs must not overwrite the files of the first array, as
+    # its tasks may still be pending
+    for job in jobs:
+        slurm_sub.resume(job)
+    slurm_sub.submit_next_batch()
+    assert (job_data.jobs_dir / "batch0_0-2.txt").read_text() == run_script_list
+    assert (job_data.jobs_dir / "batch1_0-2.txt").read_text() == run_script_list
+
+
+def test_submit_batch_max_array_size(job_data, make_job, monkeypatch):
+    slurm_sub = SlurmClusterSubmission(job_data.requirements, job_data.paths)
+    monkeypatch.setattr(slurm_sub, "MAX_ARRAY_SIZE", 2)
+    jobs = [make_job(i, paths=job_data.paths) for i in range(5)]
+    slurm_sub.add_jobs(jobs)
+
+    array_job_ids = iter(range(42, 100))
+
+    def fake_run(cmd, **kwargs):
+        stdout = f"Submitted batch job {next(array_job_ids)}\n"
+        return SimpleNamespace(stdout=stdout.encode())
+
+    monkeypatch.setattr(slurm_sub_module, "run", fake_run)
+
+    slurm_sub.submit_next_batch()
+
+    assert [job.cluster_id for job in jobs] == ["42_0", "42_1", "43_0", "43_1", "44_0"]
+    assert "#SBATCH --array=0-0\n" in (job_data.jobs_dir / "batch2_4-4.sh").read_text()
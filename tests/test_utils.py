@@ -1,5 +1,11 @@
+import pathlib
+import pickle
+import time
+
 import pytest
 
+from cluster_utils.base import constants
+from cluster_utils.base.utils import flatten_nested_string_dict
 from cluster_utils.server import utils
 
 
@@ -37,3 +43,141 @@ def test_check_valid_param_name():
     utils.check_valid_param_name("foo-bar")
     utils.check_valid_param_name("foo:bar")
     utils.check_valid_param_name("f00b4r")
+
+
+def test_save_report_data(tmp_path):
+    utils.save_report_data(tmp_path, params=["a", "b"], stats={"hook": "status"})
+
+    with open(tmp_path / constants.REPORT_DATA_FILE, "rb") as f:
+        report_data = pickle.load(f)
+    assert report_data == {"params": ["a", "b"], "stats": {"hook": "status"}}
+
+
+def test_make_temporary_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLUSTER_UTILS_CACHE_DIR", str(tmp_path))
+
+    first = utils.make_temporary_dir("foo-jobs")
+    second = utils.make_temporary_dir("foo-jobs")
+    third = utils.make_temporary_dir("foo-jobs")
+
+    assert first == str(tmp_path / "foo-jobs")
+    assert second == str(tmp_path / "foo-jobs-2")
+    assert third == str(tmp_path / "foo-jobs-3")
+    assert all(pathlib.Path(d).is_dir() for d in (first, second, third))
+
+
+def test_clone_nested_settings():
+    settings = {"a": 1, "b": {"c": "foo", "d": {"e": [1, 2, {"f": 3.0}]}}, "g": (1, 2)}
+
+    clone = utils.clone_nested_settings(settings)
+
+    assert clone == settings
+    assert clone is not settings
+    assert clone["b"] is not settings["b"]
+    assert clone["b"]["d"] is not settings["b"]["d"]
+    assert clone["b"]["d"]["e"] is not settings["b"]["d"]["e"]
+    assert clone["b"]["d"]["e"][2] is not settings["b"]["d"]["e"][2]
+
+    # modifying the clone must not affect the original
+    utils.update_recursive(clone, {"b": {"d": {"x": 42}}})
+    assert "x" not in settings["b"]["d"]
+
+
+def test_flatten_nested_string_dict():
+    nested = {"a": 1, "b": {"c": "foo", "d": {"e": [1, 2]}}, "f": {}}
+
+    assert dict(flatten_nested_string_dict(nested)) == {
+        "a": 1,
+        "b.c": "foo",
+        "b.d.e": [1, 2],
+    }
+
+    with pytest.raises(TypeError):
+        dict(flatten_nested_string_dict({"a": {1: 2}}))
+
+
+def test_dict_to_dirname():
+    setting = {"learning_rate": 0.0012345, "layers": 3, "nested": {"a": 1}}
+
+    assert utils.dict_to_dirname(setting, 7) == "7_lea=0.0012_lay=3"
+    assert utils.dict_to_dirname(setting, 7, smart_naming=False) == "7"
+    # fall back to the id if the name gets too long
+    long_setting = {f"param{i}": i for i in range(10)}
+    assert utils.dict_to_dirname(long_setting, 7) == "7"
+    # names have to be shorter than 35 characters
+    setting = {"aaa": "123456", "bbb": "1234567", "ccc": 123456}
+    assert utils.dict_to_dirname(setting, 1) == "1_aaa=123456_bbb=123456_ccc=123456"
+    assert utils.dict_to_dirname(setting, 10) == "10"
+    assert utils.dict_to_dirname({}, 7) == "7_"
+
+
+def test_copy_file_reflink(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    src.chmod(0o600)
+    dst = tmp_path / "dst.txt"
+
+    assert utils.copy_file_reflink(str(src), str(dst)) == str(dst)
+    assert dst.read_text() == "content"
+    assert dst.stat().st_mode == src.stat().st_mode
+
+    # the copy is independent of the source
+    src.write_text("changed")
+    assert dst.read_text() == "content"
+
+
+def test_rm_dir_full(tmp_path):
+    dir_to_remove = tmp_path / "foo"
+    (dir_to_remove / "bar").mkdir(parents=True)
+    (dir_to_remove / "bar" / "file.txt").write_text("content")
+
+    utils.rm_dir_full(dir_to_remove)
+    assert not dir_to_remove.exists()
+
+    # removing a non-existing directory should be a no-op
+    utils.rm_dir_full(dir_to_remove)
+    assert not dir_to_remove.exists()
+
+
+def test_rm_dir_async(tmp_path):
+    dir_to_remove = tmp_path / "foo"
+    (dir_to_remove / "bar").mkdir(parents=True)
+    (dir_to_remove / "bar" / "file.txt").write_text("content")
+
+    utils.rm_dir_async(dir_to_remove)
+    # the directory is gone immediately, so the path can be reused
+    assert not dir_to_remove.exists()
+    dir_to_remove.mkdir()
+
+    # the actual removal happens in the background
+    for _ in range(50):
+        if list(tmp_path.iterdir()) == [dir_to_remove]:
+            break
+        time.sleep(0.1)
+    assert list(tmp_path.iterdir()) == [dir_to_remove]
+
+    # removing a non-existing directory should be a no-op
+    utils.rm_dir_async(tmp_path / "does_not_exist")
+
+
+def test_rm_dirs_async(tmp_path):
+    # wait for processes started by other tests
+    for proc in utils._rm_processes:
+        proc.wait()
+
+    dirs_to_remove = [tmp_path / f"dir{i}" for i in range(3)]
+    for dir_name in dirs_to_remove:
+        (dir_name / "sub").mkdir(parents=True)
+    keep = tmp_path / "keep"
+    keep.mkdir()
+
+    utils.rm_dirs_async([*dirs_to_remove, tmp_path / "does_not_exist"])
+    assert not any(dir_name.exists() for dir_name in dirs_to_remove)
+    # all directories are removed by a single process
+    assert len(utils._rm_processes) == 1
+    utils._rm_processes[0].wait()
+    assert list(tmp_path.iterdir()) == [keep]
+
+    # finished processes are reaped on the next call
+    utils.rm_dirs_async([])
+    assert utils._rm_processes == []